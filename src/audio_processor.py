@@ -1,14 +1,53 @@
 """
 Audio processing utilities for analyzing tracks and generating waveforms.
 """
+import hashlib
+import math
+import os
+import tempfile
 import librosa
 import numpy as np
-from typing import Tuple, List
+import soundfile as sf
+from numba import njit
+from typing import Tuple
+
+try:
+    # Optional C/SIMD RMS kernel; the NumPy path below is used without it
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+# Persistent waveform cache used by generate_waveform_cached()
+WAVEFORM_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rekordbox-autocuer')
+
+
+@njit(cache=True, fastmath=True)
+def _rms_bins(audio, bins, samples_per_bin):
+    """
+    Compute per-bin RMS in a single fused pass over the audio.
+
+    The last bin absorbs any samples left over after the even split.
+    Compiled on first use (and cached on disk), so importing this module
+    doesn't pay the JIT cost when numpy_rms is available.
+    """
+    n = audio.shape[0]
+    out = np.empty(bins, dtype=np.float32)
+    for i in range(bins):
+        start = i * samples_per_bin
+        end = n if i == bins - 1 else start + samples_per_bin
+        total = 0.0
+        for j in range(start, end):
+            total += audio[j] * audio[j]
+        out[i] = math.sqrt(total / (end - start))
+    return out
 
 
 def load_audio_file(file_path: str) -> Tuple[np.ndarray, int]:
     """
-    Load an audio file using librosa.
+    Load an audio file as mono float32 samples.
+
+    Formats supported by libsndfile are decoded directly with soundfile;
+    anything else (e.g. MP3/M4A) falls back to librosa.
 
     Args:
         file_path: Path to the audio file
@@ -17,17 +56,33 @@ def load_audio_file(file_path: str) -> Tuple[np.ndarray, int]:
         Tuple of (audio_data, sample_rate)
         - audio_data: NumPy array of audio samples
         - sample_rate: Sample rate in Hz
+
+    Raises:
+        ValueError: If the file cannot be decoded by either backend
     """
+    try:
+        # Decode WAV/FLAC/OGG directly with soundfile, skipping librosa's
+        # audioread backend. float32 matches what librosa would return.
+        audio_data, sample_rate = sf.read(file_path, dtype='float32')
+        if audio_data.ndim == 2:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+        return audio_data, sample_rate
+    except sf.LibsndfileError:
+        # Format not supported by libsndfile (e.g. MP3/M4A), use librosa
+        pass
+
     try:
         # Load audio file with librosa
-        # sr=None preserves the native sample rate
+        # sr=None preserves the native sample rate. Asking for a low rate
+        # doesn't skip any decoding, it adds a resample on top, and it
+        # drops the high-frequency energy the RMS envelope is built from
         audio_data, sample_rate = librosa.load(file_path, sr=None, mono=True)
         return audio_data, sample_rate
     except Exception as e:
         raise ValueError(f"Failed to load audio file '{file_path}': {str(e)}")
 
 
-def generate_waveform_data(audio_data: np.ndarray, sample_rate: int, bins: int = 1024) -> List[float]:
+def generate_waveform_data(audio_data: np.ndarray, sample_rate: int, bins: int = 1024) -> np.ndarray:
     """
     Generate waveform data for visualization.
 
@@ -37,36 +92,179 @@ def generate_waveform_data(audio_data: np.ndarray, sample_rate: int, bins: int =
         bins: Number of bins/points to generate for the waveform
 
     Returns:
-        List of amplitude values representing the waveform envelope
+        float32 array of amplitude values representing the waveform envelope
     """
     if len(audio_data) == 0:
-        return []
+        return np.zeros(0, dtype=np.float32)
 
     # Calculate samples per bin
     samples_per_bin = len(audio_data) // bins
 
     if samples_per_bin == 0:
         # Audio is shorter than requested bins, return actual values
-        return audio_data.tolist()
+        return np.asarray(audio_data, dtype=np.float32)
 
-    waveform = []
+    audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
 
-    for i in range(bins):
-        start_idx = i * samples_per_bin
-        end_idx = start_idx + samples_per_bin
-
-        # Handle last bin to include any remaining samples
-        if i == bins - 1:
-            end_idx = len(audio_data)
-
-        # Get the chunk and calculate RMS amplitude
-        chunk = audio_data[start_idx:end_idx]
-
-        if len(chunk) > 0:
-            # Calculate RMS (root mean square) for the chunk
-            rms = np.sqrt(np.mean(chunk ** 2))
-            waveform.append(float(rms))
-        else:
-            waveform.append(0.0)
+    if numpy_rms is None:
+        return _rms_bins(audio_data, bins, samples_per_bin)
+
+    # Fused square-sum-reduce per window, no squared temporary
+    rms = numpy_rms.rms(audio_data[:bins * samples_per_bin], window_size=samples_per_bin)
+
+    # Recompute the last bin so it includes any remaining samples
+    tail = audio_data[(bins - 1) * samples_per_bin:]
+    rms[-1] = np.sqrt(np.mean(np.square(tail)))
+
+    return rms
+
+
+def generate_waveform_streaming(file_path: str, bins: int = 1024) -> np.ndarray:
+    """
+    Generate waveform data by streaming the audio file from disk.
+
+    Produces the same envelope as generate_waveform_data() on the fully
+    loaded file, but reads one bin's worth of frames at a time so peak
+    memory is O(bin) instead of O(track). Formats libsndfile cannot open
+    fall back to loading the whole file.
+
+    Args:
+        file_path: Path to the audio file
+        bins: Number of bins/points to generate for the waveform
+
+    Returns:
+        float32 array of amplitude values representing the waveform envelope
+
+    Raises:
+        ValueError: If the file cannot be decoded by either backend
+    """
+    try:
+        sound_file = sf.SoundFile(file_path)
+    except sf.LibsndfileError:
+        audio_data, sample_rate = load_audio_file(file_path)
+        return generate_waveform_data(audio_data, sample_rate, bins)
+
+    with sound_file:
+        total_frames = sound_file.frames
+        samples_per_bin = total_frames // bins
+
+        if samples_per_bin == 0:
+            # Too short to bin, the in-memory path handles this case
+            audio_data = sound_file.read(dtype='float32', always_2d=True)
+            return generate_waveform_data(audio_data.mean(axis=1, dtype=np.float32),
+                                          sound_file.samplerate, bins)
+
+        # One reusable buffer, sized for the last bin which also absorbs
+        # the remainder frames
+        last_bin_frames = total_frames - (bins - 1) * samples_per_bin
+        buffer = np.empty((last_bin_frames, sound_file.channels), dtype=np.float32)
+        waveform = np.zeros(bins, dtype=np.float32)
+
+        for i in range(bins):
+            frames = last_bin_frames if i == bins - 1 else samples_per_bin
+            block = sound_file.read(frames, dtype='float32', always_2d=True, out=buffer[:frames])
+
+            if len(block) == 0:
+                break
+
+            if sound_file.channels == 1:
+                mono = block[:, 0]
+            else:
+                mono = block.mean(axis=1, dtype=np.float32)
+
+            # Dot product is a fused square-sum with no squared temporary
+            waveform[i] = np.sqrt(np.dot(mono, mono) / len(mono))
+
+    return waveform
+
+
+def advise_willneed(file_path: str) -> None:
+    """
+    Ask the kernel to start reading a file into the page cache.
+
+    Uses posix_fadvise(POSIX_FADV_WILLNEED) where the platform has it
+    (Linux and most Unixes); elsewhere, or if the file can't be opened,
+    this does nothing. The call returns immediately and the readahead
+    runs in the background, so a decode that follows reads warm pages.
+
+    Args:
+        file_path: Path to the file that is about to be read
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        # offset 0, length 0 = the whole file
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _waveform_cache_path(file_path: str, bins: int, cache_dir: str) -> str:
+    """Cache file for a track, keyed on its path, mtime, size and bin count."""
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{bins}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.npy")
+
+
+def generate_waveform_cached(file_path: str, bins: int = 1024, cache_dir: str = None) -> np.ndarray:
+    """
+    Generate waveform data, reusing a copy saved on disk by an earlier run.
+
+    Waveforms are stored as .npy files in cache_dir, keyed on the file's
+    path, modification time, size and the bin count, so editing or
+    replacing the audio invalidates its entry. The cache is best-effort:
+    an unreadable entry is regenerated and a failed write is ignored.
+
+    Args:
+        file_path: Path to the audio file
+        bins: Number of bins/points to generate for the waveform
+        cache_dir: Cache directory (defaults to WAVEFORM_CACHE_DIR)
+
+    Returns:
+        float32 array of amplitude values representing the waveform envelope
+
+    Raises:
+        ValueError: If the file cannot be decoded by either backend
+    """
+    if cache_dir is None:
+        cache_dir = WAVEFORM_CACHE_DIR
+
+    try:
+        cache_path = _waveform_cache_path(file_path, bins, cache_dir)
+    except OSError:
+        # Missing/unreadable file, let the decoder raise its usual error
+        return generate_waveform_streaming(file_path, bins)
+
+    try:
+        return np.load(cache_path, allow_pickle=False)
+    except (OSError, ValueError):
+        pass
+
+    # Only a miss reads the audio, so only a miss warms the page cache
+    advise_willneed(file_path)
+    waveform = generate_waveform_streaming(file_path, bins)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write under a temporary name so a concurrent reader never sees
+        # a partial file
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, waveform, allow_pickle=False)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
 
     return waveform
@@ -2,40 +2,68 @@
 Batch processor for applying calculated cue points to multiple tracks.
 
 This module handles the complete workflow of:
-1. Loading the XML tree
-2. Calculating cue positions for each track
+1. Streaming the XML one collection TRACK at a time
+2. Calculating cue positions for each marked track
 3. Inserting cues into the XML
 4. Exporting the modified XML
 """
-from typing import Dict
+import logging
+from typing import Dict, List, Tuple
 from rekordbox_parser import (
-    parse_rekordbox_xml_advanced,
-    parse_rekordbox_xml,
-    get_track_element_by_id,
+    parse_track_element,
     remove_existing_cues,
-    insert_memory_cue,
-    insert_hot_cue,
-    export_modified_xml
+    insert_cues_bulk,
+    export_modified_xml_streaming
 )
 from cue_generator import calculate_cue_positions, validate_cue_positions
 
+logger = logging.getLogger(__name__)
+
+
+def _calculate_track_cues(
+    bpm: float,
+    drop_time_ms: float,
+    duration_ms: float
+) -> Tuple[List[Tuple[float, str, str, str]], bool, List[str]]:
+    """
+    Calculate and validate cue positions for one track.
+
+    Pure computation with no XML access.
+
+    Returns:
+        Tuple of (cues, is_valid, warnings)
+    """
+    cues = calculate_cue_positions(bpm, drop_time_ms, duration_ms)
+    is_valid, cue_warnings = validate_cue_positions(cues, duration_ms, bpm)
+    return cues, is_valid, cue_warnings
+
 
 def process_track_batch(
     xml_path: str,
     track_cue_dict: Dict[str, float],
     remove_existing_memory_cues: bool = True,
-    remove_existing_hot_cues: bool = False
+    remove_existing_hot_cues: bool = False,
+    verbose: bool = False,
+    pretty: bool = False
 ) -> str:
     """
     Process a batch of tracks and insert calculated cue points.
 
     Workflow:
-    1. Load XML tree
-    2. For each track with a marked drop:
-       - Calculate cue positions based on BPM and drop time
+    1. Stream the XML, copying it to a timestamped export file
+    2. For each collection TRACK with a marked drop, before it is written:
+       - Calculate and validate cue positions
        - Remove existing cues (optional)
        - Insert new memory cues and hot cue for drop
-    3. Export modified XML to timestamped file
+    3. Report marked tracks that never appeared in the collection
+
+    Only one TRACK is held in memory at a time, so the whole library is
+    never built as a DOM. If a TrackID appears more than once, the first
+    TRACK gets the cues, matching get_track_element_by_id().
+
+    Progress is reported through the module logger. The end-of-batch
+    summary is logged at INFO; per-track and per-cue detail is logged at
+    DEBUG unless verbose is set, in which case it is promoted to INFO.
 
     Args:
         xml_path: Path to the original Rekordbox XML file
@@ -43,6 +71,8 @@ def process_track_batch(
                        Example: {'123': 60000.0, '456': 45000.0}
         remove_existing_memory_cues: If True, remove existing memory cues before adding new ones
         remove_existing_hot_cues: If True, also remove existing hot cues
+        verbose: If True, log per-track and per-cue detail at INFO
+        pretty: If True, pretty-print the exported XML
 
     Returns:
         Path to the exported XML file
@@ -57,16 +87,10 @@ def process_track_batch(
         >>> output_path = process_track_batch('rekordbox.xml', track_dict)
         >>> print(f"Exported to: {output_path}")
     """
-    print(f"\n{'=' * 70}")
-    print(f"BATCH PROCESSOR: Processing {len(track_cue_dict)} tracks")
-    print(f"{'=' * 70}\n")
-
-    # Load XML tree
-    print(f"Loading XML: {xml_path}")
-    tree = parse_rekordbox_xml_advanced(xml_path)
-    xml_data = parse_rekordbox_xml(xml_path)  # Also get parsed data for track info
+    detail = logger.info if verbose else logger.debug
+    detail_enabled = logger.isEnabledFor(logging.INFO if verbose else logging.DEBUG)
 
-    tracks_dict = xml_data.get('tracks', {})
+    logger.info("Batch processor: processing %d tracks", len(track_cue_dict))
 
     # Statistics
     successful_tracks = 0
@@ -74,131 +98,119 @@ def process_track_batch(
     total_cues_added = 0
     warnings = []
 
-    # Process each track
-    for track_id, drop_time_ms in track_cue_dict.items():
-        print(f"\n--- Processing Track ID: {track_id} ---")
+    # Marked tracks not yet seen in the collection
+    pending = dict(track_cue_dict)
 
-        # Get track element from XML
-        track_element = get_track_element_by_id(tree, track_id)
+    def apply_track_cues(track_element) -> None:
+        """Calculate and insert cues for one streamed collection TRACK."""
+        nonlocal successful_tracks, failed_tracks, total_cues_added
 
-        if track_element is None:
-            error_msg = f"Track ID {track_id} not found in XML"
-            print(f"ERROR: {error_msg}")
-            warnings.append(error_msg)
-            failed_tracks += 1
-            continue
-
-        # Get track info
-        track_info = tracks_dict.get(track_id)
-        if track_info is None:
-            error_msg = f"Track ID {track_id} not in parsed data"
-            print(f"ERROR: {error_msg}")
-            warnings.append(error_msg)
-            failed_tracks += 1
-            continue
+        track_id = track_element.get('TrackID')
+        if not track_id or track_id not in pending:
+            return
+        drop_time_ms = pending.pop(track_id)
 
+        track_info = parse_track_element(track_element)
         track_name = track_info['name']
-        artist = track_info['artist']
-        bpm = track_info['bpm']
-        duration_ms = track_info['duration_ms']
 
-        print(f"Track: {artist} - {track_name}")
-        print(f"BPM: {bpm:.1f}, Duration: {duration_ms / 1000:.1f}s")
-        print(f"Drop at: {drop_time_ms / 1000:.1f}s")
+        detail(
+            "Track %s: %s - %s (BPM: %.1f, Duration: %.1fs, Drop at: %.1fs)",
+            track_info['track_id'], track_info['artist'], track_name, track_info['bpm'],
+            track_info['duration_ms'] / 1000, drop_time_ms / 1000
+        )
 
-        # Calculate cue positions
+        # Calculate and validate cue positions. This stays inline: it is ~5us
+        # of work per track, far less than a worker process costs to start
+        # or to pickle results back from, and the stream is C-bound in lxml.
         try:
-            cues = calculate_cue_positions(bpm, drop_time_ms, duration_ms)
-            print(f"Calculated {len(cues)} cue positions")
-
-            # Validate cues
-            is_valid, cue_warnings = validate_cue_positions(cues, duration_ms, bpm)
+            cues, is_valid, cue_warnings = _calculate_track_cues(
+                track_info['bpm'], drop_time_ms, track_info['duration_ms']
+            )
+            detail("Calculated %d cue positions", len(cues))
 
-            if cue_warnings:
-                print("Warnings:")
-                for warning in cue_warnings:
-                    print(f"  - {warning}")
-                    warnings.append(f"Track '{track_name}': {warning}")
+            for warning in cue_warnings:
+                logger.warning("Track '%s': %s", track_name, warning)
+                warnings.append(f"Track '{track_name}': {warning}")
 
             if not is_valid:
                 error_msg = f"Cue validation failed for track '{track_name}'"
-                print(f"ERROR: {error_msg}")
+                logger.warning(error_msg)
                 warnings.append(error_msg)
                 failed_tracks += 1
-                continue
+                return
 
         except Exception as e:
             error_msg = f"Failed to calculate cues for track '{track_name}': {str(e)}"
-            print(f"ERROR: {error_msg}")
+            logger.error(error_msg)
             warnings.append(error_msg)
             failed_tracks += 1
-            continue
+            return
 
-        # Remove existing cues if requested
-        if remove_existing_memory_cues or remove_existing_hot_cues:
+        # Remove existing cues if requested. The single child lookup lets
+        # tracks without any POSITION_MARK skip the removal walk.
+        if ((remove_existing_memory_cues or remove_existing_hot_cues)
+                and track_element.find('POSITION_MARK') is not None):
             removed = remove_existing_cues(
                 track_element,
                 remove_memory=remove_existing_memory_cues,
                 remove_hot=remove_existing_hot_cues
             )
             if removed > 0:
-                print(f"Removed {removed} existing cues")
+                detail("Removed %d existing cues", removed)
 
         # Insert new cues
-        cues_added = 0
-        for cue_time_ms, cue_type, cue_name, color in cues:
-            try:
-                if cue_type == 'hot':
-                    # Insert as hot cue (Drop gets hot cue slot)
-                    insert_hot_cue(track_element, cue_time_ms, cue_name, color)
-                    print(f"  + Hot Cue: {cue_name} at {cue_time_ms / 1000:.1f}s ({color})")
-                else:
-                    # Insert as memory cue
-                    insert_memory_cue(track_element, cue_time_ms, cue_name, color)
-                    print(f"  + Memory Cue: {cue_name} at {cue_time_ms / 1000:.1f}s ({color})")
-
-                cues_added += 1
-                total_cues_added += 1
-
-            except Exception as e:
-                error_msg = f"Failed to insert cue '{cue_name}' for track '{track_name}': {str(e)}"
-                print(f"  ERROR: {error_msg}")
-                warnings.append(error_msg)
+        try:
+            inserted = insert_cues_bulk(track_element, cues)
+        except Exception as e:
+            error_msg = f"Failed to insert cues for track '{track_name}': {str(e)}"
+            logger.error(error_msg)
+            warnings.append(error_msg)
+            inserted = []
+
+        if detail_enabled:
+            for cue_time_ms, cue_type, cue_name, color in inserted:
+                cue_label = "Hot Cue" if cue_type == 'hot' else "Memory Cue"
+                detail("  + %s: %s at %.1fs (%s)", cue_label, cue_name, cue_time_ms / 1000, color)
+
+        cues_added = len(inserted)
+        total_cues_added += cues_added
 
         if cues_added > 0:
-            print(f"Successfully added {cues_added} cues")
             successful_tracks += 1
         else:
             failed_tracks += 1
 
-    # Export modified XML
-    print(f"\n{'=' * 70}")
-    print("Exporting modified XML...")
-
+    # Stream the XML through to the export, applying cues on the way
+    detail("Streaming XML: %s", xml_path)
     try:
-        output_path = export_modified_xml(tree)
-        print(f"SUCCESS: Exported to {output_path}")
+        output_path = export_modified_xml_streaming(xml_path, apply_track_cues, pretty=pretty)
+    except (FileNotFoundError, ValueError):
+        raise
     except Exception as e:
         error_msg = f"Failed to export XML: {str(e)}"
-        print(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         raise IOError(error_msg)
 
-    # Summary
-    print(f"\n{'=' * 70}")
-    print("BATCH PROCESSING SUMMARY")
-    print(f"{'=' * 70}")
-    print(f"Total tracks processed: {len(track_cue_dict)}")
-    print(f"Successful: {successful_tracks}")
-    print(f"Failed: {failed_tracks}")
-    print(f"Total cues added: {total_cues_added}")
+    for track_id in pending:
+        error_msg = f"Track ID {track_id} not found in XML"
+        logger.warning(error_msg)
+        warnings.append(error_msg)
+        failed_tracks += 1
 
+    # Summary
+    summary = [
+        f"Exported to {output_path}",
+        f"Total tracks processed: {len(track_cue_dict)}",
+        f"Successful: {successful_tracks}",
+        f"Failed: {failed_tracks}",
+        f"Total cues added: {total_cues_added}",
+    ]
     if warnings:
-        print(f"\nWarnings ({len(warnings)}):")
-        for warning in warnings[:10]:  # Show first 10 warnings
-            print(f"  - {warning}")
+        summary.append(f"Warnings ({len(warnings)}):")
+        summary.extend(f"  - {warning}" for warning in warnings[:10])  # Show first 10 warnings
         if len(warnings) > 10:
-            print(f"  ... and {len(warnings) - 10} more warnings")
+            summary.append(f"  ... and {len(warnings) - 10} more warnings")
 
-    print(f"{'=' * 70}\n")
+    logger.info("Batch processing summary:\n%s", "\n".join(summary))
 
     return output_path
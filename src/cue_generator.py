@@ -6,6 +6,31 @@ cues around a user-marked drop point.
 """
 from typing import List, Tuple
 
+import numpy as np
+
+
+# Cue positions relative to the drop, in ascending offset order
+# Format: (bars_offset, cue_name, cue_type, color)
+CUE_DEFINITIONS = (
+    (-32, "-32 bars", "memory", "orange"),   # 32 bars before drop
+    (-16, "-16 bars", "memory", "yellow"),   # 16 bars before drop
+    (0, "Drop", "hot", "red"),               # The drop itself
+    (16, "+16 bars", "memory", "blue"),      # 16 bars after drop
+    (32, "+32 bars", "memory", "aqua"),      # 32 bars after drop
+)
+
+_BAR_OFFSETS = np.array([definition[0] for definition in CUE_DEFINITIONS], dtype=np.float64)
+
+# Lookup tables for the small-integer codes returned by
+# calculate_cue_positions_soa(). Labels follow CUE_DEFINITIONS order, so a
+# label code is also the cue's column in calculate_cue_positions_batch().
+CUE_LABELS = tuple(definition[1] for definition in CUE_DEFINITIONS)
+CUE_TYPES = ("memory", "hot")
+CUE_COLORS = tuple(dict.fromkeys(definition[3] for definition in CUE_DEFINITIONS))
+
+_TYPE_CODES = np.array([CUE_TYPES.index(definition[2]) for definition in CUE_DEFINITIONS], dtype=np.uint8)
+_COLOR_CODES = np.array([CUE_COLORS.index(definition[3]) for definition in CUE_DEFINITIONS], dtype=np.uint8)
+
 
 def calculate_cue_positions(
     bpm: float,
@@ -78,19 +103,11 @@ def calculate_cue_positions(
     beat_duration_ms = 60000.0 / bpm
     bar_duration_ms = beat_duration_ms * beats_per_bar
 
-    # Define cue positions relative to drop
-    # Format: (bars_offset, cue_name, cue_type, color)
-    cue_definitions = [
-        (-32, "-32 bars", "memory", "orange"),   # 32 bars before drop
-        (-16, "-16 bars", "memory", "yellow"),   # 16 bars before drop
-        (0, "Drop", "hot", "red"),               # The drop itself
-        (16, "+16 bars", "memory", "blue"),      # 16 bars after drop
-        (32, "+32 bars", "memory", "aqua"),      # 32 bars after drop
-    ]
-
+    # Offsets are ascending, so the cues come out already sorted by time.
+    # A plain loop beats NumPy here: five multiplies cost less than the
+    # array setup; calculate_cue_positions_batch() covers the bulk case.
     cues = []
-
-    for bar_offset, cue_name, cue_type, color in cue_definitions:
+    for bar_offset, cue_name, cue_type, color in CUE_DEFINITIONS:
         # Calculate absolute time position
         time_ms = drop_time_ms + (bar_offset * bar_duration_ms)
 
@@ -98,13 +115,108 @@ def calculate_cue_positions(
         if 0 <= time_ms <= track_duration_ms:
             cues.append((time_ms, cue_type, cue_name, color))
 
-    # Sort by time (should already be sorted, but ensure it)
-    cues.sort(key=lambda x: x[0])
-
     return cues
 
 
-def snap_to_grid(time_ms: float, bpm: float, grid_resolution: int = 4) -> float:
+def calculate_cue_positions_batch(
+    bpms: np.ndarray,
+    drops_ms: np.ndarray,
+    durations_ms: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate cue times for many tracks in one vectorized pass.
+
+    Equivalent to calling calculate_cue_positions() (4/4 time) per track,
+    but returns arrays instead of building a list of tuples per track.
+    Column j of the result corresponds to CUE_DEFINITIONS[j].
+
+    Args:
+        bpms: Track tempos in beats per minute, shape (n_tracks,)
+        drops_ms: Drop times in milliseconds, shape (n_tracks,)
+        durations_ms: Track durations in milliseconds, shape (n_tracks,)
+
+    Returns:
+        Tuple of (times_ms, in_bounds)
+        - times_ms: float64 array of shape (n_tracks, len(CUE_DEFINITIONS))
+        - in_bounds: bool array of the same shape, True where the cue falls
+          within [0, track duration] and would be returned by
+          calculate_cue_positions()
+
+    Example:
+        >>> times, mask = calculate_cue_positions_batch(
+        ...     np.array([120.0, 128.0]), np.array([60000.0, 90000.0]),
+        ...     np.array([180000.0, 240000.0]))
+        >>> times[0][mask[0]]  # 28s, 44s, 60s, 76s, 92s
+    """
+    bpms = np.asarray(bpms, dtype=np.float64)
+    drops_ms = np.asarray(drops_ms, dtype=np.float64)
+    durations_ms = np.asarray(durations_ms, dtype=np.float64)
+
+    if (bpms <= 0).any():
+        raise ValueError("BPM must be positive for every track")
+    if (drops_ms < 0).any():
+        raise ValueError("Drop time cannot be negative")
+    if (durations_ms <= 0).any():
+        raise ValueError("Track duration must be positive for every track")
+
+    # Bar duration per track (4/4), broadcast against the fixed bar offsets
+    bar_durations_ms = (60000.0 / bpms) * 4
+    times = drops_ms[:, None] + bar_durations_ms[:, None] * _BAR_OFFSETS[None, :]
+
+    in_bounds = (times >= 0) & (times <= durations_ms[:, None])
+
+    return times, in_bounds
+
+
+def calculate_cue_positions_soa(
+    bpms: np.ndarray,
+    drops_ms: np.ndarray,
+    durations_ms: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate every in-bounds cue for many tracks as flat parallel arrays.
+
+    The structure-of-arrays form of calculate_cue_positions_batch(): instead
+    of one tuple of Python objects per cue, each field is a contiguous array
+    and the strings are replaced by small codes into CUE_LABELS, CUE_TYPES
+    and CUE_COLORS. That is ~19 bytes per cue rather than a 4-tuple with
+    its object headers, so a whole library stays cache-resident.
+
+    Args:
+        bpms: Track tempos in beats per minute, shape (n_tracks,)
+        drops_ms: Drop times in milliseconds, shape (n_tracks,)
+        durations_ms: Track durations in milliseconds, shape (n_tracks,)
+
+    Returns:
+        Tuple of (track_index, times_ms, type_codes, label_codes, color_codes),
+        all of length n_cues, ordered by track and then by time:
+        - track_index: intp index of the input track each cue belongs to
+        - times_ms: float64 cue times in milliseconds
+        - type_codes: uint8 indices into CUE_TYPES
+        - label_codes: uint8 indices into CUE_LABELS
+        - color_codes: uint8 indices into CUE_COLORS
+
+    Example:
+        >>> track, times, types, labels, colors = calculate_cue_positions_soa(
+        ...     np.array([120.0]), np.array([60000.0]), np.array([180000.0]))
+        >>> [CUE_LABELS[code] for code in labels]
+        ['-16 bars', 'Drop', '+16 bars', '+32 bars']
+    """
+    times, in_bounds = calculate_cue_positions_batch(bpms, drops_ms, durations_ms)
+
+    # Row-major nonzero keeps each track's cues together and in offset order
+    track_index, columns = np.nonzero(in_bounds)
+
+    return (
+        track_index,
+        times[track_index, columns],
+        _TYPE_CODES[columns],
+        columns.astype(np.uint8),
+        _COLOR_CODES[columns],
+    )
+
+
+def snap_to_grid(time_ms, bpm: float, grid_resolution: int = 4):
     """
     Snap a time position to the nearest beat grid position.
 
@@ -113,13 +225,15 @@ def snap_to_grid(time_ms: float, bpm: float, grid_resolution: int = 4) -> float:
     slightly off-time.
 
     Args:
-        time_ms: Time position in milliseconds to snap
+        time_ms: Time position in milliseconds to snap, or a NumPy array of
+                 positions to snap in one vectorized call
         bpm: Track tempo in beats per minute
         grid_resolution: Grid divisions (4 = quarter notes, 8 = eighth notes, etc.)
                         Higher values = finer grid, lower values = coarser grid
 
     Returns:
-        Snapped time position in milliseconds
+        Snapped time position in milliseconds (a float for scalar input,
+        a float64 array for array input)
 
     Example:
         >>> # At 120 BPM, beats are 500ms apart
@@ -134,15 +248,17 @@ def snap_to_grid(time_ms: float, bpm: float, grid_resolution: int = 4) -> float:
     if grid_resolution <= 0:
         raise ValueError(f"Grid resolution must be positive, got {grid_resolution}")
 
-    # Calculate grid interval
-    beat_duration_ms = 60000.0 / bpm
-    grid_interval_ms = beat_duration_ms / (grid_resolution / 4)
+    # Grid interval = beat duration / (grid_resolution / 4), folded into
+    # one reciprocal so snapping is a multiply, a rint and a multiply
+    grid_interval_ms = 240000.0 / (bpm * grid_resolution)
+    intervals_per_ms = (bpm * grid_resolution) / 240000.0
 
-    # Snap to nearest grid position
-    num_intervals = round(time_ms / grid_interval_ms)
-    snapped_time = num_intervals * grid_interval_ms
+    # Plain float math for the common scalar call; NumPy only pays off for arrays
+    if not isinstance(time_ms, np.ndarray):
+        return round(time_ms * intervals_per_ms) * grid_interval_ms
 
-    return snapped_time
+    # np.rint rounds half to even, same as the built-in round()
+    return np.rint(time_ms * intervals_per_ms) * grid_interval_ms
 
 
 def validate_cue_positions(
@@ -186,7 +302,7 @@ def validate_cue_positions(
         return True, warnings  # Not an error, just a note
 
     # Check each cue's time bounds
-    for i, (time_ms, cue_type, cue_name, color) in enumerate(cues):
+    for time_ms, cue_type, cue_name, color in cues:
         # Check if cue is before track start
         if time_ms < 0:
             warnings.append(f"Cue '{cue_name}' at {format_cue_time(time_ms)} is before track start")
@@ -197,8 +313,12 @@ def validate_cue_positions(
             warnings.append(f"Cue '{cue_name}' at {format_cue_time(time_ms)} is after track end")
             is_valid = False
 
-    # Check for overlapping or too-close cues
-    sorted_cues = sorted(cues, key=lambda x: x[0])
+    # Check for overlapping or too-close cues. calculate_cue_positions()
+    # already returns cues in time order, so only sort when needed.
+    sorted_cues = cues
+    if any(cues[i][0] > cues[i + 1][0] for i in range(len(cues) - 1)):
+        sorted_cues = sorted(cues, key=lambda x: x[0])
+
     for i in range(len(sorted_cues) - 1):
         time1 = sorted_cues[i][0]
         time2 = sorted_cues[i + 1][0]
@@ -2,85 +2,176 @@
 Rekordbox XML parser for extracting playlist and track information.
 Also handles XML modification to insert calculated cue points.
 """
+import logging
 from lxml import etree
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import os
+import re
+import threading
 from datetime import datetime
+from urllib.parse import unquote
 
+logger = logging.getLogger(__name__)
 
-def parse_rekordbox_xml(file_path: str) -> dict:
+
+# Compiled once at import instead of re-parsing the path string per call.
+# Rekordbox always writes COLLECTION and PLAYLISTS as direct children of the
+# DJ_PLAYLISTS root, so the paths are anchored there; a `.//COLLECTION`
+# XPath would scan every descendant of a large library to collect matches.
+_XPATH_COLLECTION = etree.XPath('/DJ_PLAYLISTS/COLLECTION')
+_XPATH_PLAYLISTS = etree.XPath('/DJ_PLAYLISTS/PLAYLISTS')
+# Type 1 = Playlist (not folder); the predicate is evaluated inside libxml2
+_XPATH_PLAYLIST_NODES = etree.XPath('descendant::NODE[@Type="1"]')
+# POSITION_MARK is always a direct child of TRACK, so no descendant walk
+_XPATH_HOT_CUE_NUMS = etree.XPath('POSITION_MARK/@Num')
+
+# Rekordbox Location prefix, with or without the localhost authority
+_FILE_URL_RE = re.compile(r'^file://(?:localhost)?/')
+_IS_WINDOWS = os.name == 'nt'
+
+
+def parse_rekordbox_xml(file_path: str, index_only: bool = False) -> dict:
     """
     Parse a Rekordbox XML export file.
 
+    The file is stream-parsed: each collection TRACK and playlist NODE is
+    extracted as soon as it has been read and then freed, so memory stays
+    flat regardless of library size.
+
+    With index_only, collection TRACKs are skipped and only the playlists
+    are read. 'tracks' starts out empty and get_playlist_tracks() loads
+    the tracks of a playlist from the file the first time it is asked for.
+
     Args:
         file_path: Path to the Rekordbox XML file
+        index_only: If True, defer reading track metadata
 
     Returns:
         Dictionary with keys 'playlists' and 'tracks'
-        - playlists: List of playlist dictionaries with 'name' and 'track_ids'
+        - playlists: Dictionary mapping playlist name to a playlist dictionary
+          with 'name' and 'track_ids', in document order. If several
+          playlists share a name, the first one wins.
         - tracks: Dictionary mapping track_id to track data
+        With index_only there is also 'xml_path', the file tracks are
+        loaded from.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"XML file not found: {file_path}")
 
+    tracks = {}
+    playlists = {}
+
     try:
-        tree = etree.parse(file_path)
-        root = tree.getroot()
-    except Exception as e:
+        for _, elem in etree.iterparse(file_path, events=('end',), tag=('TRACK', 'NODE')):
+            if elem.tag == 'TRACK':
+                parent = elem.getparent()
+                if parent is None or parent.tag != 'COLLECTION':
+                    # Playlist entry, read when its NODE is complete
+                    continue
+
+                if not index_only:
+                    track = parse_track_element(elem)
+                    if track is not None:
+                        tracks[track['track_id']] = track
+                _clear_element(elem)
+
+            # Type 1 = Playlist (not folder)
+            elif elem.get('Type') == '1' and elem.get('Name'):
+                playlists.setdefault(elem.get('Name'), _playlist_from_node(elem))
+                _clear_element(elem)
+
+    except etree.XMLSyntaxError as e:
+        raise ValueError(f"Failed to parse XML file: {str(e)}")
+
+    xml_data = {
+        'playlists': playlists,
+        'tracks': tracks
+    }
+    if index_only:
+        xml_data['xml_path'] = file_path
+    return xml_data
+
+
+def load_tracks(file_path: str, track_ids) -> Dict[str, dict]:
+    """
+    Stream the collection and parse only the requested tracks.
+
+    Stops reading as soon as every requested track has been found, which
+    for a playlist near the start of the collection skips most of the file.
+
+    Args:
+        file_path: Path to the Rekordbox XML file
+        track_ids: TrackIDs to load
+
+    Returns:
+        Dictionary mapping track_id to track data for the IDs found in
+        the collection. If a TrackID appears more than once, the first wins.
+
+    Raises:
+        FileNotFoundError: If the XML file doesn't exist
+        ValueError: If XML parsing fails
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"XML file not found: {file_path}")
+
+    remaining = set(track_ids)
+    tracks = {}
+
+    try:
+        for _, elem in etree.iterparse(file_path, events=('end',), tag='TRACK'):
+            if not remaining:
+                break
+
+            parent = elem.getparent()
+            if parent is None or parent.tag != 'COLLECTION':
+                # Playlist entry
+                continue
+
+            track_id = elem.get('TrackID')
+            if track_id in remaining:
+                remaining.discard(track_id)
+                tracks[track_id] = parse_track_element(elem)
+            _clear_element(elem)
+
+    except etree.XMLSyntaxError as e:
         raise ValueError(f"Failed to parse XML file: {str(e)}")
 
+    return tracks
+
+
+def parse_rekordbox_xml_from_tree(tree) -> dict:
+    """
+    Extract playlist and track information from an already-parsed XML tree.
+
+    Lets callers that also need the tree for modification (see
+    parse_rekordbox_xml_advanced) avoid parsing the same file twice.
+
+    Args:
+        tree: lxml ElementTree object
+
+    Returns:
+        Same structure as parse_rekordbox_xml()
+    """
     # Parse tracks from COLLECTION element
     tracks = {}
-    collection = root.find('.//COLLECTION')
+    collection = get_collection_element(tree)
 
     if collection is not None:
-        for track in collection.findall('TRACK'):
-            track_id = track.get('TrackID')
-            if track_id:
-                # Extract cue points
-                cue_points = []
-                for position_mark in track.findall('.//POSITION_MARK'):
-                    cue_type = position_mark.get('Type')
-                    if cue_type == '0':  # Standard cue point
-                        cue_points.append({
-                            'name': position_mark.get('Name', ''),
-                            'position': float(position_mark.get('Start', 0)),
-                            'type': 'cue'
-                        })
-
-                tracks[track_id] = {
-                    'track_id': track_id,
-                    'name': track.get('Name', ''),
-                    'artist': track.get('Artist', ''),
-                    'bpm': float(track.get('AverageBpm', 0)),
-                    'duration_ms': int(float(track.get('TotalTime', 0)) * 1000),
-                    'key': track.get('Tonality', ''),
-                    'file_path': track.get('Location', ''),
-                    'cue_points': cue_points
-                }
+        for track_element in collection.iterchildren('TRACK'):
+            track = parse_track_element(track_element)
+            if track is not None:
+                tracks[track['track_id']] = track
 
     # Parse playlists from PLAYLISTS element
-    playlists = []
-    playlists_node = root.find('.//PLAYLISTS')
+    playlists = {}
+    playlists_node = _first_match(_XPATH_PLAYLISTS, tree)
 
     if playlists_node is not None:
-        # Skip the root node which contains all playlists
-        for node in playlists_node.findall('.//NODE'):
-            node_type = node.get('Type')
-            node_name = node.get('Name')
-
-            # Type 1 = Playlist (not folder)
-            if node_type == '1' and node_name:
-                track_ids = []
-                for track in node.findall('TRACK'):
-                    key = track.get('Key')
-                    if key:
-                        track_ids.append(key)
-
-                playlists.append({
-                    'name': node_name,
-                    'track_ids': track_ids
-                })
+        # Playlists at any folder depth
+        for node in _XPATH_PLAYLIST_NODES(playlists_node):
+            name = node.get('Name')
+            if name:
+                playlists.setdefault(name, _playlist_from_node(node))
 
     return {
         'playlists': playlists,
@@ -88,10 +179,101 @@ def parse_rekordbox_xml(file_path: str) -> dict:
     }
 
 
+def _first_match(xpath, node):
+    """
+    Evaluate a compiled XPath and return its first result.
+
+    Args:
+        xpath: Compiled etree.XPath object
+        node: lxml Element or ElementTree to evaluate against
+
+    Returns:
+        First matching element, or None if nothing matched
+    """
+    matches = xpath(node)
+    return matches[0] if matches else None
+
+
+def parse_track_element(track) -> Optional[dict]:
+    """
+    Build the track dictionary for a collection TRACK element.
+
+    Used by both parsers, and by streaming callers (see
+    export_modified_xml_streaming()) that only see one TRACK at a time.
+
+    Args:
+        track: lxml Element object for the TRACK
+
+    Returns:
+        Track dictionary, or None if the element has no TrackID
+    """
+    track_id = track.get('TrackID')
+    if not track_id:
+        return None
+
+    # Extract cue points (POSITION_MARK is always a direct child of TRACK)
+    cue_points = []
+    for position_mark in track.iterchildren('POSITION_MARK'):
+        if position_mark.get('Type') == '0':  # Standard cue point
+            cue_points.append({
+                'name': position_mark.get('Name', ''),
+                'position': float(position_mark.get('Start', 0)),
+                'type': 'cue'
+            })
+
+    return {
+        'track_id': track_id,
+        'name': track.get('Name', ''),
+        'artist': track.get('Artist', ''),
+        'bpm': float(track.get('AverageBpm', 0)),
+        'duration_ms': int(float(track.get('TotalTime', 0)) * 1000),
+        'key': track.get('Tonality', ''),
+        'file_path': track.get('Location', ''),
+        'cue_points': cue_points
+    }
+
+
+def _playlist_from_node(node) -> dict:
+    """
+    Build the playlist dictionary for a playlist NODE element.
+
+    Args:
+        node: lxml Element object for the NODE (Type="1")
+
+    Returns:
+        Playlist dictionary with 'name' and 'track_ids'
+    """
+    track_ids = []
+    for track in node.iterchildren('TRACK'):
+        key = track.get('Key')
+        if key:
+            track_ids.append(key)
+
+    return {
+        'name': node.get('Name'),
+        'track_ids': track_ids
+    }
+
+
+def _clear_element(elem) -> None:
+    """
+    Free a fully processed element and its preceding siblings during iterparse.
+
+    Args:
+        elem: lxml Element object that has already been consumed
+    """
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
 def get_playlist_tracks(xml_data: dict, playlist_name: str) -> list:
     """
     Get all tracks from a specific playlist.
 
+    For xml_data parsed with index_only, tracks not loaded yet are read
+    from the file with load_tracks() and added to xml_data['tracks'].
+
     Args:
         xml_data: Parsed XML data from parse_rekordbox_xml()
         playlist_name: Name of the playlist to retrieve
@@ -99,26 +281,27 @@ def get_playlist_tracks(xml_data: dict, playlist_name: str) -> list:
     Returns:
         List of track dictionaries with keys: name, artist, bpm, duration_ms,
         cue_points, file_path, key
+
+    Raises:
+        FileNotFoundError: If deferred tracks must be loaded and the XML
+            file is gone
+        ValueError: If loading deferred tracks fails to parse the XML
     """
-    # Find the playlist by name
-    playlist = None
-    for pl in xml_data.get('playlists', []):
-        if pl['name'] == playlist_name:
-            playlist = pl
-            break
+    playlist = xml_data.get('playlists', {}).get(playlist_name)
 
     if not playlist:
         return []
 
-    # Get tracks by their IDs
     tracks_dict = xml_data.get('tracks', {})
-    tracks = []
 
-    for track_id in playlist['track_ids']:
-        if track_id in tracks_dict:
-            tracks.append(tracks_dict[track_id])
+    xml_path = xml_data.get('xml_path')
+    if xml_path:
+        missing = [track_id for track_id in playlist['track_ids'] if track_id not in tracks_dict]
+        if missing:
+            tracks_dict.update(load_tracks(xml_path, missing))
 
-    return tracks
+    # Get tracks by their IDs, skipping any missing from the collection
+    return [tracks_dict[track_id] for track_id in playlist['track_ids'] if track_id in tracks_dict]
 
 
 def extract_track_audio_path(xml_data: dict, track_id: str) -> str:
@@ -139,18 +322,11 @@ def extract_track_audio_path(xml_data: dict, track_id: str) -> str:
 
     file_path = tracks[track_id].get('file_path', '')
 
-    # Rekordbox uses file:// URLs, decode them
-    if file_path.startswith('file://localhost/'):
-        file_path = file_path.replace('file://localhost/', '')
-    elif file_path.startswith('file:///'):
-        file_path = file_path.replace('file:///', '')
-
-    # URL decode the path
-    from urllib.parse import unquote
-    file_path = unquote(file_path)
+    # Rekordbox uses file:// URLs, strip the prefix and URL decode the path
+    file_path = unquote(_FILE_URL_RE.sub('', file_path, count=1))
 
     # On Windows, convert forward slashes to backslashes
-    if os.name == 'nt':
+    if _IS_WINDOWS:
         file_path = file_path.replace('/', '\\')
 
     return file_path
@@ -172,6 +348,31 @@ REKORDBOX_COLORS = {
     'purple': (153, 51, 255),   # 7
 }
 
+# Attribute-ready RGB strings, so cue insertion does no int -> str work
+_REKORDBOX_COLORS_STR = {
+    name: (str(red), str(green), str(blue))
+    for name, (red, green, blue) in REKORDBOX_COLORS.items()
+}
+_DEFAULT_WHITE = ('255', '255', '255')
+
+
+# One DOM parser per thread, reused across parse_rekordbox_xml_advanced()
+# calls (lxml parsers must not be shared between threads). Blank text is
+# dropped so the tree is smaller and faster to walk, which also lets
+# pretty=True exports re-indent cleanly. Rekordbox XML has no xml:id, so the
+# id table is skipped, and huge_tree lifts libxml2's limits for very large
+# libraries.
+_parser_local = threading.local()
+
+
+def _get_dom_parser():
+    """Return this thread's reusable XMLParser for full-tree parsing."""
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = etree.XMLParser(remove_blank_text=True, huge_tree=True, collect_ids=False)
+        _parser_local.parser = parser
+    return parser
+
 
 def parse_rekordbox_xml_advanced(file_path: str):
     """
@@ -191,7 +392,10 @@ def parse_rekordbox_xml_advanced(file_path: str):
         raise FileNotFoundError(f"XML file not found: {file_path}")
 
     try:
-        tree = etree.parse(file_path)
+        # libxml2 reads the path in small chunks straight into the parser, so
+        # there is no whole-file buffer for mmap to save; mapping the file
+        # only adds its pages to RSS on top of the DOM
+        tree = etree.parse(file_path, _get_dom_parser())
         return tree
     except Exception as e:
         raise ValueError(f"Failed to parse XML file: {str(e)}")
@@ -199,21 +403,122 @@ def parse_rekordbox_xml_advanced(file_path: str):
 
 def _get_rgb_for_color(color: str) -> tuple:
     """
-    Get RGB values for a color name.
+    Get RGB attribute values for a color name.
 
     Args:
         color: Color name (e.g., 'red', 'orange', 'blue')
 
     Returns:
-        Tuple of (red, green, blue) values (0-255)
+        Tuple of (red, green, blue) values (0-255) as attribute strings
     """
-    color_lower = color.lower()
-    if color_lower in REKORDBOX_COLORS:
-        return REKORDBOX_COLORS[color_lower]
+    # One probe on the common path; the warning only costs on a miss
+    rgb = _REKORDBOX_COLORS_STR.get(color.lower())
+    if rgb is not None:
+        return rgb
 
     # Default to white if color not found
-    print(f"Warning: Unknown color '{color}', defaulting to white")
-    return (255, 255, 255)
+    logger.warning("Unknown color '%s', defaulting to white", color)
+    return _DEFAULT_WHITE
+
+
+def _add_position_mark(track_element, time_ms: float, name: str, color: str,
+                       hot_cue_num: Optional[int] = None):
+    """
+    Create a POSITION_MARK for a cue as the last child of a track.
+
+    The element is created with SubElement directly inside the track's
+    document, rather than built detached and appended, which in lxml would
+    move it across documents on every insert.
+
+    Args:
+        track_element: lxml Element object for the TRACK
+        time_ms: Cue position in milliseconds
+        name: Cue point name
+        color: Color name (e.g., 'red', 'orange', 'blue')
+        hot_cue_num: Hot cue slot (0-7), or None for a memory cue
+
+    Returns:
+        lxml Element object for the new POSITION_MARK
+    """
+    # Convert milliseconds to seconds (Rekordbox uses seconds). The float
+    # format is a single C call; an integer divmod + zero-padded f-string
+    # measured ~1.6x slower on CPython 3.11 for identical output.
+    start = f'{time_ms / 1000.0:.3f}'
+
+    # Get RGB color. Calculated cues already use the lowercase table names,
+    # so try them as-is before the normalizing lookup.
+    red, green, blue = _REKORDBOX_COLORS_STR.get(color) or _get_rgb_for_color(color)
+
+    # Type 0 without Num = memory cue, Type 0 with Num = hot cue. Each
+    # attribute dict is built in one display to keep the per-cue Python
+    # work small next to the SubElement call itself.
+    if hot_cue_num is None:
+        attrib = {'Name': name, 'Type': '0', 'Start': start,
+                  'Red': red, 'Green': green, 'Blue': blue}
+    else:
+        attrib = {'Name': name, 'Type': '0', 'Start': start, 'Num': str(hot_cue_num),
+                  'Red': red, 'Green': green, 'Blue': blue}
+
+    return etree.SubElement(track_element, 'POSITION_MARK', attrib=attrib)
+
+
+def _get_occupied_hot_cue_slots(track_element) -> set:
+    """
+    Collect the hot cue slot numbers already used on a track.
+
+    Args:
+        track_element: lxml Element object for the TRACK
+
+    Returns:
+        Set of occupied slot numbers
+    """
+    # Attribute results are plain strings; non-numeric slots are ignored
+    return {int(num) for num in _XPATH_HOT_CUE_NUMS(track_element) if num.isdigit()}
+
+
+class HotCueAllocator:
+    """
+    Hands out free hot cue slots (0-7) for one track.
+
+    The track's existing slots are scanned once, on the first allocation,
+    and then tracked in memory, so K hot cue inserts on the same track cost
+    one child scan instead of K.
+
+    Example:
+        >>> allocator = HotCueAllocator(track_element)
+        >>> insert_hot_cue(track_element, 60000.0, "Drop", "red", allocator=allocator)
+    """
+
+    NUM_SLOTS = 8
+
+    def __init__(self, track_element):
+        self.track_element = track_element
+        self._occupied = None
+
+    @property
+    def occupied(self) -> set:
+        """Slot numbers currently in use on the track."""
+        if self._occupied is None:
+            self._occupied = _get_occupied_hot_cue_slots(self.track_element)
+        return self._occupied
+
+    def allocate(self) -> Optional[int]:
+        """
+        Claim the lowest free slot.
+
+        Returns:
+            Slot number, or None if all slots are occupied
+        """
+        occupied = self.occupied
+        for slot in range(self.NUM_SLOTS):
+            if slot not in occupied:
+                occupied.add(slot)
+                return slot
+        return None
+
+    def reserve(self, slot: int) -> None:
+        """Mark an explicitly chosen slot as used."""
+        self.occupied.add(slot)
 
 
 def insert_memory_cue(track_element, time_ms: float, name: str, color: str) -> None:
@@ -235,26 +540,11 @@ def insert_memory_cue(track_element, time_ms: float, name: str, color: str) -> N
         - Start is in seconds as a float
         - Red/Green/Blue are RGB color values (0-255)
     """
-    # Convert milliseconds to seconds (Rekordbox uses seconds)
-    time_seconds = time_ms / 1000.0
-
-    # Get RGB color
-    red, green, blue = _get_rgb_for_color(color)
+    _add_position_mark(track_element, time_ms, name, color)
 
-    # Create POSITION_MARK element
-    position_mark = etree.Element('POSITION_MARK')
-    position_mark.set('Name', name)
-    position_mark.set('Type', '0')  # 0 = memory cue
-    position_mark.set('Start', f'{time_seconds:.3f}')
-    position_mark.set('Red', str(red))
-    position_mark.set('Green', str(green))
-    position_mark.set('Blue', str(blue))
 
-    # Add to track element
-    track_element.append(position_mark)
-
-
-def insert_hot_cue(track_element, time_ms: float, name: str, color: str, hot_cue_num: int = -1) -> None:
+def insert_hot_cue(track_element, time_ms: float, name: str, color: str, hot_cue_num: int = -1,
+                   allocator: Optional[HotCueAllocator] = None) -> None:
     """
     Insert a hot cue into a track's POSITION_MARK list.
 
@@ -268,6 +558,8 @@ def insert_hot_cue(track_element, time_ms: float, name: str, color: str, hot_cue
         name: Hot cue name
         color: Color name (e.g., 'red', 'orange', 'blue')
         hot_cue_num: Hot cue slot number (0-7), -1 for auto-assign to first available
+        allocator: Optional HotCueAllocator for this track. Pass the same one
+                   when inserting several hot cues to avoid rescanning slots.
 
     Note:
         - Type="0" with Num attribute indicates a hot cue
@@ -275,45 +567,65 @@ def insert_hot_cue(track_element, time_ms: float, name: str, color: str, hot_cue
         - Start is in seconds as a float
         - Red/Green/Blue are RGB color values (0-255)
     """
-    # Convert milliseconds to seconds
-    time_seconds = time_ms / 1000.0
-
-    # Get RGB color
-    red, green, blue = _get_rgb_for_color(color)
-
     # Auto-assign hot cue number if not specified
     if hot_cue_num == -1:
-        # Find first available hot cue slot
-        existing_hot_cues = set()
-        for pm in track_element.findall('.//POSITION_MARK'):
-            if pm.get('Num') is not None:
-                try:
-                    existing_hot_cues.add(int(pm.get('Num')))
-                except ValueError:
-                    pass
-
-        # Find first available slot (0-7)
-        for i in range(8):
-            if i not in existing_hot_cues:
-                hot_cue_num = i
-                break
+        if allocator is None:
+            allocator = HotCueAllocator(track_element)
+        hot_cue_num = allocator.allocate()
 
-        if hot_cue_num == -1:
-            print(f"Warning: All hot cue slots occupied, skipping hot cue '{name}'")
+        if hot_cue_num is None:
+            logger.warning("All hot cue slots occupied, skipping hot cue '%s'", name)
             return
+    elif allocator is not None:
+        allocator.reserve(hot_cue_num)
+
+    _add_position_mark(track_element, time_ms, name, color, hot_cue_num)
 
-    # Create POSITION_MARK element
-    position_mark = etree.Element('POSITION_MARK')
-    position_mark.set('Name', name)
-    position_mark.set('Type', '0')  # Type 0 with Num = hot cue
-    position_mark.set('Start', f'{time_seconds:.3f}')
-    position_mark.set('Num', str(hot_cue_num))
-    position_mark.set('Red', str(red))
-    position_mark.set('Green', str(green))
-    position_mark.set('Blue', str(blue))
 
-    # Add to track element
-    track_element.append(position_mark)
+def insert_cues_bulk(track_element, cues: List[tuple]) -> List[tuple]:
+    """
+    Insert all of a track's calculated cues in one call.
+
+    Hot cues are auto-assigned to free slots, with the occupied slots
+    scanned once per track rather than once per hot cue.
+
+    Args:
+        track_element: lxml Element object for the TRACK
+        cues: List of cue tuples (time_ms, cue_type, cue_name, color) as
+              returned by calculate_cue_positions()
+
+    Returns:
+        List of the cue tuples that were inserted. Hot cues are dropped
+        when all 8 slots are occupied.
+
+    Raises:
+        Any error from building a POSITION_MARK. The marks already added for
+        this call are removed first, so the track is left as it was.
+    """
+    allocator = HotCueAllocator(track_element)
+    inserted = []
+
+    # New marks are appended, so everything from here on belongs to this call
+    first_new = len(track_element)
+
+    try:
+        for cue in cues:
+            time_ms, cue_type, name, color = cue
+            hot_cue_num = None
+
+            if cue_type == 'hot':
+                hot_cue_num = allocator.allocate()
+                if hot_cue_num is None:
+                    logger.warning("All hot cue slots occupied, skipping hot cue '%s'", name)
+                    continue
+
+            _add_position_mark(track_element, time_ms, name, color, hot_cue_num)
+            inserted.append(cue)
+    except Exception:
+        del track_element[first_new:]
+        raise
+
+    return inserted
 
 
 def remove_existing_cues(track_element, remove_memory: bool = True, remove_hot: bool = False) -> int:
@@ -333,33 +645,51 @@ def remove_existing_cues(track_element, remove_memory: bool = True, remove_hot:
         Set remove_hot=True to also clear hot cues.
     """
     removed_count = 0
+    kept = []
 
-    # Find all POSITION_MARK elements
-    position_marks = track_element.findall('.//POSITION_MARK')
+    # Partition the children in one pass, then rebuild the child list once
+    # instead of unlinking each removed cue individually
+    for child in track_element:
+        if child.tag == 'POSITION_MARK':
+            is_hot_cue = child.get('Num') is not None
+            if (remove_hot if is_hot_cue else remove_memory):
+                removed_count += 1
+                continue
+        kept.append(child)
 
-    for pm in position_marks:
-        is_hot_cue = pm.get('Num') is not None
+    if removed_count:
+        track_element[:] = kept
 
-        should_remove = False
-        if is_hot_cue and remove_hot:
-            should_remove = True
-        elif not is_hot_cue and remove_memory:
-            should_remove = True
+    return removed_count
 
-        if should_remove:
-            track_element.remove(pm)
-            removed_count += 1
 
-    return removed_count
+def _default_export_path() -> str:
+    """
+    Build a timestamped output path in the 'exports' directory.
 
+    Returns:
+        Path such as exports/rekordbox_autocued_2025-01-15_14-32-05.xml
+    """
+    # Create exports directory if it doesn't exist (no separate stat, and no
+    # race if another export creates it first)
+    exports_dir = 'exports'
+    os.makedirs(exports_dir, exist_ok=True)
+
+    # Generate timestamp filename
+    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    return os.path.join(exports_dir, f'rekordbox_autocued_{timestamp}.xml')
 
-def export_modified_xml(tree, output_path: str = None) -> str:
+
+def export_modified_xml(tree, output_path: str = None, pretty: bool = False) -> str:
     """
     Export the modified XML tree to a file with timestamp.
 
     Args:
         tree: lxml ElementTree object
         output_path: Optional custom output path. If None, creates in 'exports' directory
+        pretty: If True, re-indent the output for human readers. Off by
+                default: Rekordbox does not need it, and compact output is
+                faster to write and smaller to re-import.
 
     Returns:
         Path to the exported XML file
@@ -370,23 +700,17 @@ def export_modified_xml(tree, output_path: str = None) -> str:
     Example output filename:
         exports/rekordbox_autocued_2025-01-15_14-32-05.xml
     """
-    # Create exports directory if it doesn't exist
     if output_path is None:
-        exports_dir = 'exports'
-        if not os.path.exists(exports_dir):
-            os.makedirs(exports_dir)
-
-        # Generate timestamp filename
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        output_path = os.path.join(exports_dir, f'rekordbox_autocued_{timestamp}.xml')
+        output_path = _default_export_path()
 
     try:
-        # Write XML with proper formatting
+        # libxml2 serializes straight to the file, without building the
+        # whole document as a bytes object first
         tree.write(
             output_path,
             encoding='UTF-8',
             xml_declaration=True,
-            pretty_print=True
+            pretty_print=pretty
         )
 
         return output_path
@@ -395,24 +719,199 @@ def export_modified_xml(tree, output_path: str = None) -> str:
         raise IOError(f"Failed to export XML: {str(e)}")
 
 
-def get_track_element_by_id(tree, track_id: str):
+def export_modified_xml_streaming(
+    file_path: str,
+    modify_track: Optional[Callable] = None,
+    output_path: str = None,
+    pretty: bool = False
+) -> str:
+    """
+    Copy a Rekordbox XML file to a new export, modifying tracks on the way.
+
+    The streaming counterpart to parse_rekordbox_xml_advanced() plus
+    export_modified_xml(): the source is read with iterparse and written
+    with an incremental xmlfile serializer, one collection TRACK at a time,
+    so peak memory is a single track rather than the whole library. Other
+    top-level sections (PRODUCT, PLAYLISTS) are copied through unchanged.
+
+    Args:
+        file_path: Path to the original Rekordbox XML file
+        modify_track: Optional callback run on each collection TRACK element
+                      before it is written, e.g. to insert cues
+        output_path: Optional custom output path. If None, creates in 'exports' directory
+        pretty: If True, pretty-print each written section
+
+    Returns:
+        Path to the exported XML file
+
+    Raises:
+        FileNotFoundError: If XML file doesn't exist
+        ValueError: If XML parsing fails
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"XML file not found: {file_path}")
+
+    if output_path is None:
+        output_path = _default_export_path()
+
+    # Write to a side file and only move it into place once the whole source
+    # has been copied: xmlfile closes any open elements when it unwinds, so a
+    # parse error mid-stream would otherwise leave a well-formed but
+    # truncated library at output_path
+    partial_path = f'{output_path}.part'
+
+    try:
+        with etree.xmlfile(partial_path, encoding='UTF-8') as xf:
+            xf.write_declaration()
+
+            # Attributes are available on start events, children only on end
+            context = etree.iterparse(file_path, events=('start', 'end'))
+            _, root = next(context)
+
+            with xf.element(root.tag, dict(root.attrib)):
+                for event, elem in context:
+                    if event == 'start':
+                        if elem.tag == 'COLLECTION' and elem.getparent() is root:
+                            _write_separator(xf, 1, pretty)
+                            _stream_collection(xf, context, elem, modify_track, pretty)
+                        continue
+
+                    # Any other top-level section is small enough to copy whole
+                    if elem.getparent() is root:
+                        _write_separator(xf, 1, pretty)
+                        _write_subtree(xf, elem, 1, pretty)
+                        _clear_element(elem)
+
+                _write_separator(xf, 0, pretty)
+
+        os.replace(partial_path, output_path)
+
+    except Exception as e:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        if isinstance(e, etree.XMLSyntaxError):
+            raise ValueError(f"Failed to parse XML file: {str(e)}")
+        raise
+
+    return output_path
+
+
+def _stream_collection(xf, context, collection, modify_track: Optional[Callable], pretty: bool) -> None:
+    """
+    Write a COLLECTION element track by track as its children finish parsing.
+
+    Consumes events from the shared iterparse context up to and including
+    the end of the COLLECTION.
+    """
+    with xf.element(collection.tag, dict(collection.attrib)):
+        wrote_child = False
+        for event, elem in context:
+            if event != 'end':
+                continue
+            if elem is collection:
+                break
+            if elem.getparent() is collection:
+                if modify_track is not None and elem.tag == 'TRACK':
+                    modify_track(elem)
+                _write_separator(xf, 2, pretty)
+                _write_subtree(xf, elem, 2, pretty)
+                _clear_element(elem)
+                wrote_child = True
+
+        if wrote_child:
+            _write_separator(xf, 1, pretty)
+
+
+def _write_subtree(xf, elem, level: int, pretty: bool) -> None:
+    """
+    Write one fully parsed element at the given nesting level.
+
+    The source tail belongs to the surrounding document layout, which the
+    streaming writer lays out itself, so it is dropped rather than copied.
+    """
+    elem.tail = None
+    if pretty:
+        etree.indent(elem, space='  ', level=level)
+    xf.write(elem)
+
+
+def _write_separator(xf, level: int, pretty: bool) -> None:
+    """Start a new indented line before the next tag when pretty-printing."""
+    if pretty:
+        xf.write('\n' + '  ' * level)
+
+
+def get_collection_element(tree):
+    """
+    Get the COLLECTION element of a Rekordbox XML tree.
+
+    lxml trees can't carry a cached attribute, so callers doing many lookups
+    should fetch the collection once with this and pass it to
+    build_track_index() or get_track_element_by_id() in place of the tree.
+
+    Args:
+        tree: lxml ElementTree object, or an element that is already the
+              COLLECTION (returned as is)
+
+    Returns:
+        lxml Element object for the COLLECTION, or None if there is none
+    """
+    if getattr(tree, 'tag', None) == 'COLLECTION':
+        return tree
+    return _first_match(_XPATH_COLLECTION, tree)
+
+
+def build_track_index(tree) -> Dict[str, object]:
+    """
+    Map every collection TrackID to its TRACK element in one pass.
+
+    Build this once when looking up many tracks in the same tree, and pass
+    it to get_track_element_by_id() instead of the tree.
+
+    Args:
+        tree: lxml ElementTree object, or its COLLECTION element
+
+    Returns:
+        Dictionary mapping track_id to lxml Element object for the TRACK.
+        On duplicate TrackIDs the first TRACK wins, matching a tree scan;
+        TRACKs without a TrackID are skipped.
+    """
+    collection = get_collection_element(tree)
+
+    if collection is None:
+        return {}
+
+    track_index = {}
+    for track in collection.iterchildren('TRACK'):
+        track_id = track.get('TrackID')
+        if track_id:
+            track_index.setdefault(track_id, track)
+
+    return track_index
+
+
+def get_track_element_by_id(tree_or_index, track_id: str):
     """
     Find a TRACK element by its TrackID attribute.
 
     Args:
-        tree: lxml ElementTree object
+        tree_or_index: lxml ElementTree object, its COLLECTION element (see
+                       get_collection_element()), or an index from
+                       build_track_index() for an O(1) lookup
         track_id: Track ID to search for
 
     Returns:
         lxml Element object for the TRACK, or None if not found
     """
-    root = tree.getroot()
-    collection = root.find('.//COLLECTION')
+    if isinstance(tree_or_index, dict):
+        return tree_or_index.get(track_id)
+
+    collection = get_collection_element(tree_or_index)
 
     if collection is None:
         return None
 
-    for track in collection.findall('TRACK'):
+    for track in collection.iterchildren('TRACK'):
         if track.get('TrackID') == track_id:
             return track
 
@@ -0,0 +1,195 @@
+"""
+Unit tests for audio_processor module.
+
+Run from the src directory with: python -m pytest test_audio_processor.py -v
+"""
+import numpy as np
+import pytest
+import soundfile as sf
+import audio_processor
+from audio_processor import (
+    load_audio_file, generate_waveform_data, generate_waveform_streaming, generate_waveform_cached,
+    advise_willneed
+)
+
+
+def _reference_rms_bins(audio_data, bins):
+    """Straightforward per-bin RMS used as the expected result."""
+    samples_per_bin = len(audio_data) // bins
+    waveform = []
+    for i in range(bins):
+        start_idx = i * samples_per_bin
+        end_idx = len(audio_data) if i == bins - 1 else start_idx + samples_per_bin
+        chunk = audio_data[start_idx:end_idx]
+        waveform.append(float(np.sqrt(np.mean(chunk ** 2))))
+    return waveform
+
+
+class TestGenerateWaveformData:
+    """Tests for generate_waveform_data function."""
+
+    def test_evenly_divisible_length(self):
+        """Test binning when the audio length is a multiple of bins."""
+        audio_data = np.random.default_rng(0).standard_normal(1024 * 64).astype(np.float32)
+
+        waveform = generate_waveform_data(audio_data, 44100, bins=1024)
+
+        assert waveform.shape == (1024,)
+        assert waveform.dtype == np.float32
+        assert np.allclose(waveform, _reference_rms_bins(audio_data, 1024), rtol=1e-5)
+
+    def test_last_bin_includes_remainder(self):
+        """Test that trailing samples are folded into the last bin."""
+        audio_data = np.zeros(1000 + 7, dtype=np.float32)
+        audio_data[-7:] = 1.0  # Only the remainder is non-silent
+
+        waveform = generate_waveform_data(audio_data, 44100, bins=10)
+
+        assert len(waveform) == 10
+        assert all(value == 0.0 for value in waveform[:-1])
+        # Last bin covers 100 + 7 samples, 7 of which are 1.0
+        assert abs(waveform[-1] - np.sqrt(7 / 107)) < 1e-6
+
+    def test_numba_kernel_matches_reference(self, monkeypatch):
+        """Test the JIT kernel path used when numpy-rms is not installed."""
+        monkeypatch.setattr(audio_processor, 'numpy_rms', None)
+        audio_data = np.random.default_rng(1).standard_normal(1024 * 50 + 13).astype(np.float32)
+
+        waveform = generate_waveform_data(audio_data, 44100, bins=1024)
+
+        assert np.allclose(waveform, _reference_rms_bins(audio_data, 1024), rtol=1e-5)
+
+    def test_constant_signal(self):
+        """Test that a constant signal has RMS equal to its amplitude."""
+        audio_data = np.full(44100, 0.5, dtype=np.float32)
+
+        waveform = generate_waveform_data(audio_data, 44100, bins=100)
+
+        assert np.allclose(waveform, 0.5)
+
+    def test_empty_audio(self):
+        """Test edge case: empty audio returns no bins."""
+        assert len(generate_waveform_data(np.array([], dtype=np.float32), 44100)) == 0
+
+    def test_audio_shorter_than_bins(self):
+        """Test edge case: fewer samples than bins returns raw samples."""
+        audio_data = np.array([0.1, -0.2, 0.3], dtype=np.float32)
+
+        waveform = generate_waveform_data(audio_data, 44100, bins=1024)
+
+        assert np.allclose(waveform, audio_data)
+
+
+class TestLoadAudioFile:
+    """Tests for load_audio_file function."""
+
+    def test_stereo_wav_downmixed_to_mono(self, tmp_path):
+        """Test that multi-channel files are averaged down to mono float32."""
+        left = np.full(4410, 0.5, dtype=np.float32)
+        right = np.full(4410, -0.25, dtype=np.float32)
+        file_path = tmp_path / "stereo.wav"
+        sf.write(file_path, np.column_stack([left, right]), 44100, subtype='FLOAT')
+
+        audio_data, sample_rate = load_audio_file(str(file_path))
+
+        assert sample_rate == 44100
+        assert audio_data.ndim == 1
+        assert audio_data.dtype == np.float32
+        assert np.allclose(audio_data, 0.125)
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing file raises ValueError."""
+        with pytest.raises(ValueError, match="Failed to load audio file"):
+            load_audio_file(str(tmp_path / "missing.wav"))
+
+
+class TestGenerateWaveformStreaming:
+    """Tests for generate_waveform_streaming function."""
+
+    def test_matches_in_memory_path(self, tmp_path):
+        """Test streaming envelope equals binning the fully loaded file."""
+        rng = np.random.default_rng(2)
+        samples = (rng.standard_normal((1024 * 20 + 11, 2)) * 0.3).astype(np.float32)
+        file_path = tmp_path / "track.wav"
+        sf.write(file_path, samples, 44100, subtype='FLOAT')
+
+        streamed = generate_waveform_streaming(str(file_path), bins=1024)
+        audio_data, sample_rate = load_audio_file(str(file_path))
+        in_memory = generate_waveform_data(audio_data, sample_rate, bins=1024)
+
+        assert streamed.shape == (1024,)
+        assert streamed.dtype == np.float32
+        assert np.allclose(streamed, in_memory, rtol=1e-4)
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing file raises ValueError."""
+        with pytest.raises(ValueError, match="Failed to load audio file"):
+            generate_waveform_streaming(str(tmp_path / "missing.wav"))
+
+
+class TestGenerateWaveformCached:
+    """Tests for generate_waveform_cached function."""
+
+    @pytest.fixture
+    def track_path(self, tmp_path):
+        samples = (np.random.default_rng(3).standard_normal(1024 * 8) * 0.3).astype(np.float32)
+        file_path = tmp_path / "track.wav"
+        sf.write(file_path, samples, 44100, subtype='FLOAT')
+        return str(file_path)
+
+    def test_miss_then_hit(self, tmp_path, track_path, monkeypatch):
+        """Test a second call loads from disk without decoding."""
+        cache_dir = str(tmp_path / "cache")
+
+        first = generate_waveform_cached(track_path, bins=256, cache_dir=cache_dir)
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("decoded on a cache hit")
+        monkeypatch.setattr(audio_processor, 'generate_waveform_streaming', fail)
+
+        second = generate_waveform_cached(track_path, bins=256, cache_dir=cache_dir)
+        assert second.dtype == np.float32
+        assert np.array_equal(first, second)
+
+    def test_modified_file_invalidates(self, tmp_path, track_path):
+        """Test rewriting the audio produces a new cache entry."""
+        cache_dir = str(tmp_path / "cache")
+        generate_waveform_cached(track_path, bins=256, cache_dir=cache_dir)
+
+        sf.write(track_path, np.ones(1024 * 9, dtype=np.float32) * 0.5, 44100, subtype='FLOAT')
+        waveform = generate_waveform_cached(track_path, bins=256, cache_dir=cache_dir)
+
+        assert np.allclose(waveform, 0.5)
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+
+    def test_unwritable_cache_dir(self, tmp_path, track_path):
+        """Test a cache that can't be created still returns the waveform."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+
+        waveform = generate_waveform_cached(track_path, bins=256, cache_dir=str(blocker / "cache"))
+
+        assert np.allclose(waveform, generate_waveform_streaming(track_path, bins=256))
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing file raises ValueError."""
+        with pytest.raises(ValueError, match="Failed to load audio file"):
+            generate_waveform_cached(str(tmp_path / "missing.wav"), cache_dir=str(tmp_path))
+
+
+class TestAdviseWillneed:
+    """Tests for advise_willneed function."""
+
+    def test_existing_file(self, tmp_path):
+        """Test that advising a readable file leaves it unchanged."""
+        file_path = tmp_path / "track.wav"
+        file_path.write_bytes(b"\0" * 4096)
+
+        advise_willneed(str(file_path))
+
+        assert file_path.read_bytes() == b"\0" * 4096
+
+    def test_missing_file_ignored(self, tmp_path):
+        """Test that a missing file is silently ignored."""
+        advise_willneed(str(tmp_path / "missing.wav"))
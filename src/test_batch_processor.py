@@ -0,0 +1,74 @@
+"""
+Unit tests for batch_processor module.
+
+Run from the src directory with: python -m pytest test_batch_processor.py -v
+"""
+import logging
+import os
+import pytest
+from batch_processor import process_track_batch
+from rekordbox_parser import parse_rekordbox_xml
+from test_rekordbox_parser import SAMPLE_XML
+
+
+@pytest.fixture
+def sample_xml_path(tmp_path, monkeypatch):
+    """Write the sample export and run from a temp dir so exports/ lands there."""
+    monkeypatch.chdir(tmp_path)
+    file_path = tmp_path / "rekordbox.xml"
+    file_path.write_text(SAMPLE_XML, encoding="utf-8")
+    return str(file_path)
+
+
+class TestProcessTrackBatch:
+    """Tests for process_track_batch function."""
+
+    def test_cues_inserted_and_exported(self, sample_xml_path):
+        """Test that marked tracks get the full cue layout in the export."""
+        # 128 BPM -> 1875ms per bar, 16 bars = 30s, 32 bars = 60s
+        output_path = process_track_batch(sample_xml_path, {'101': 90000.0})
+
+        assert os.path.dirname(output_path) == 'exports'
+        assert os.path.exists(output_path)
+
+        cue_points = parse_rekordbox_xml(output_path)['tracks']['101']['cue_points']
+        names = [cue['name'] for cue in cue_points]
+        # Existing memory cues are replaced, the existing hot cue is kept
+        assert names == ["Hot A", "-32 bars", "-16 bars", "Drop", "+16 bars", "+32 bars"]
+        assert [cue['position'] for cue in cue_points[1:]] == [30.0, 60.0, 90.0, 120.0, 150.0]
+
+    def test_unknown_track_skipped(self, sample_xml_path):
+        """Test that unknown track IDs don't prevent the export."""
+        output_path = process_track_batch(sample_xml_path, {'999': 60000.0, '102': 90000.0})
+
+        tracks = parse_rekordbox_xml(output_path)['tracks']
+        assert len(tracks['102']['cue_points']) == 5
+        assert tracks['103']['cue_points'] == []
+
+    def test_per_cue_detail_only_when_verbose(self, sample_xml_path, caplog):
+        """Test that INFO carries just the summary unless verbose is set."""
+        caplog.set_level(logging.INFO, logger='batch_processor')
+
+        process_track_batch(sample_xml_path, {'101': 90000.0})
+        quiet = caplog.text
+        caplog.clear()
+        process_track_batch(sample_xml_path, {'101': 90000.0}, verbose=True)
+
+        assert "Total cues added: 5" in quiet
+        assert "+ Hot Cue: Drop" not in quiet
+        assert "+ Hot Cue: Drop at 90.0s (red)" in caplog.text
+
+    def test_malformed_xml_leaves_no_export(self, sample_xml_path):
+        """Test that a parse error partway through writes no export file."""
+        with open(sample_xml_path, 'w', encoding='utf-8') as xml_file:
+            xml_file.write(SAMPLE_XML[:SAMPLE_XML.index('<TRACK TrackID="103"')])
+
+        with pytest.raises(ValueError):
+            process_track_batch(sample_xml_path, {'101': 90000.0})
+
+        assert os.listdir('exports') == []
+
+    def test_missing_xml(self, tmp_path):
+        """Test error handling: Missing XML file."""
+        with pytest.raises(FileNotFoundError):
+            process_track_batch(str(tmp_path / "missing.xml"), {'101': 60000.0})
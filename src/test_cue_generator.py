@@ -1,11 +1,17 @@
 """
 Unit tests for cue_generator module.
 
-Run with: python -m pytest src/test_cue_generator.py -v
+Run from the src directory with: python -m pytest test_cue_generator.py -v
 """
+import numpy as np
 import pytest
 from cue_generator import (
     calculate_cue_positions,
+    calculate_cue_positions_batch,
+    calculate_cue_positions_soa,
+    CUE_LABELS,
+    CUE_TYPES,
+    CUE_COLORS,
     snap_to_grid,
     validate_cue_positions,
     format_cue_time
@@ -209,6 +215,62 @@ class TestCalculateCuePositions:
         assert any(abs(cue[0] - 36000.0) < 0.01 for cue in cues)
 
 
+class TestCalculateCuePositionsBatch:
+    """Tests for calculate_cue_positions_batch function."""
+
+    def test_matches_per_track_calculation(self):
+        """Test that each row matches calculate_cue_positions for that track."""
+        bpms = np.array([120.0, 128.0, 174.0])
+        drops = np.array([60000.0, 30000.0, 150000.0])
+        durations = np.array([180000.0, 240000.0, 160000.0])
+
+        times, in_bounds = calculate_cue_positions_batch(bpms, drops, durations)
+
+        assert times.shape == in_bounds.shape == (3, 5)
+        for i in range(3):
+            expected = calculate_cue_positions(bpms[i], drops[i], durations[i])
+            assert times[i][in_bounds[i]].tolist() == [cue[0] for cue in expected]
+
+    def test_invalid_bpm(self):
+        """Test error handling: Any non-positive BPM is rejected."""
+        with pytest.raises(ValueError, match="BPM must be positive"):
+            calculate_cue_positions_batch(
+                np.array([128.0, 0.0]), np.array([1000.0, 1000.0]), np.array([9000.0, 9000.0])
+            )
+
+
+class TestCalculateCuePositionsSoa:
+    """Tests for calculate_cue_positions_soa function."""
+
+    def test_decodes_to_per_track_cues(self):
+        """Test that decoding the codes gives calculate_cue_positions output per track."""
+        bpms = np.array([120.0, 128.0, 174.0])
+        drops = np.array([60000.0, 30000.0, 150000.0])
+        durations = np.array([180000.0, 240000.0, 160000.0])
+
+        track, times, types, labels, colors = calculate_cue_positions_soa(bpms, drops, durations)
+
+        assert types.dtype == labels.dtype == colors.dtype == np.uint8
+        decoded = [
+            (int(t), time_ms, CUE_TYPES[kind], CUE_LABELS[label], CUE_COLORS[color])
+            for t, time_ms, kind, label, color in zip(track, times.tolist(), types, labels, colors)
+        ]
+        expected = [
+            (i, *cue)
+            for i in range(3)
+            for cue in calculate_cue_positions(bpms[i], drops[i], durations[i])
+        ]
+        assert decoded == expected
+
+    def test_no_cues(self):
+        """Test that an empty batch gives empty arrays."""
+        empty = np.array([], dtype=np.float64)
+
+        track, times, types, labels, colors = calculate_cue_positions_soa(empty, empty, empty)
+
+        assert len(track) == len(times) == len(types) == len(labels) == len(colors) == 0
+
+
 class TestSnapToGrid:
     """Tests for snap_to_grid function."""
 
@@ -236,6 +298,15 @@ class TestSnapToGrid:
         assert snap_to_grid(1000.0, bpm, 4) == 1000.0
         assert snap_to_grid(2000.0, bpm, 4) == 2000.0
 
+    def test_snap_array(self):
+        """Test that an array of positions is snapped element-wise."""
+        times = np.array([1230.0, 1750.0, 260.0, 240.0])
+
+        snapped = snap_to_grid(times, 120.0, 4)
+
+        assert isinstance(snapped, np.ndarray)
+        assert snapped.tolist() == [1000.0, 2000.0, 500.0, 0.0]
+
     def test_snap_invalid_bpm(self):
         """Test error handling: Invalid BPM."""
         with pytest.raises(ValueError, match="BPM must be positive"):
@@ -299,6 +370,23 @@ class TestValidateCuePositions:
         # Should still be valid but with warning
         assert any("too close together" in w for w in warnings)
 
+    def test_unsorted_cues_spacing_checked_in_time_order(self):
+        """Test that spacing is checked between time-adjacent cues."""
+        cues = [
+            (30500.0, "hot", "Cue2", "blue"),
+            (60000.0, "memory", "Cue3", "aqua"),
+            (30000.0, "memory", "Cue1", "red"),
+        ]
+
+        is_valid, warnings = validate_cue_positions(cues, 180000.0, 120.0)
+
+        assert is_valid
+        close = [w for w in warnings if "too close together" in w]
+        assert close == [
+            "Cues 'Cue1' and 'Cue2' are too close together "
+            "(500ms apart, minimum 1000ms recommended)"
+        ]
+
     def test_short_track_warning(self):
         """Test validation warns about short tracks."""
         cues = [
@@ -0,0 +1,548 @@
+"""
+Unit tests for rekordbox_parser module.
+
+Run from the src directory with: python -m pytest test_rekordbox_parser.py -v
+"""
+import pytest
+from lxml import etree
+import rekordbox_parser
+from rekordbox_parser import (
+    parse_rekordbox_xml,
+    parse_rekordbox_xml_advanced,
+    parse_rekordbox_xml_from_tree,
+    load_tracks,
+    get_playlist_tracks,
+    extract_track_audio_path,
+    build_track_index,
+    get_collection_element,
+    get_track_element_by_id,
+    insert_memory_cue,
+    insert_hot_cue,
+    insert_cues_bulk,
+    HotCueAllocator,
+    remove_existing_cues,
+    export_modified_xml,
+    export_modified_xml_streaming
+)
+
+
+SAMPLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<DJ_PLAYLISTS Version="1.0.0">
+  <PRODUCT Name="rekordbox" Version="6.8.2" Company="AlphaTheta"/>
+  <COLLECTION Entries="3">
+    <TRACK TrackID="101" Name="First Track" Artist="Artist A" AverageBpm="128.00"
+           TotalTime="240" Tonality="8A" Location="file://localhost/C:/Music/first.mp3">
+      <TEMPO Inizio="0.025" Bpm="128.00" Metro="4/4" Battito="1"/>
+      <POSITION_MARK Name="Intro" Type="0" Start="0.025"/>
+      <POSITION_MARK Name="Hot A" Type="0" Start="30.025" Num="0" Red="255" Green="0" Blue="0"/>
+      <POSITION_MARK Name="Loop" Type="4" Start="60.000" End="62.000"/>
+    </TRACK>
+    <TRACK TrackID="102" Name="Second Track" Artist="Artist B" AverageBpm="140.00"
+           TotalTime="300" Tonality="5A" Location="file://localhost/C:/Music/second%20track.wav"/>
+    <TRACK TrackID="103" Name="Third Track" Artist="Artist C" AverageBpm="174.00"
+           TotalTime="200" Tonality="1A" Location="file:///C:/Music/third.flac"/>
+  </COLLECTION>
+  <PLAYLISTS>
+    <NODE Type="0" Name="ROOT" Count="2">
+      <NODE Type="1" Name="Peak Time" KeyType="0" Entries="2">
+        <TRACK Key="102"/>
+        <TRACK Key="101"/>
+      </NODE>
+      <NODE Type="0" Name="Folder" Count="1">
+        <NODE Type="1" Name="Warm Up" KeyType="0" Entries="2">
+          <TRACK Key="103"/>
+          <TRACK Key="999"/>
+        </NODE>
+      </NODE>
+    </NODE>
+  </PLAYLISTS>
+</DJ_PLAYLISTS>
+"""
+
+
+@pytest.fixture
+def sample_xml_path(tmp_path):
+    """Write the sample Rekordbox export to a temporary file."""
+    file_path = tmp_path / "rekordbox.xml"
+    file_path.write_text(SAMPLE_XML, encoding="utf-8")
+    return str(file_path)
+
+
+class TestParseRekordboxXml:
+    """Tests for parse_rekordbox_xml function."""
+
+    def test_tracks_parsed(self, sample_xml_path):
+        """Test track metadata extraction from COLLECTION."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+        tracks = xml_data['tracks']
+
+        assert set(tracks) == {'101', '102', '103'}
+
+        track = tracks['101']
+        assert track['track_id'] == '101'
+        assert track['name'] == "First Track"
+        assert track['artist'] == "Artist A"
+        assert track['bpm'] == 128.0
+        assert track['duration_ms'] == 240000
+        assert track['key'] == "8A"
+        assert track['file_path'] == "file://localhost/C:/Music/first.mp3"
+
+    def test_only_standard_cues_collected(self, sample_xml_path):
+        """Test that only Type="0" position marks are returned as cue points."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+        cue_points = xml_data['tracks']['101']['cue_points']
+
+        assert [cue['name'] for cue in cue_points] == ["Intro", "Hot A"]
+        assert cue_points[1]['position'] == 30.025
+        assert all(cue['type'] == 'cue' for cue in cue_points)
+
+    def test_playlists_parsed(self, sample_xml_path):
+        """Test playlist extraction, including playlists nested in folders."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+        playlists = xml_data['playlists']
+
+        assert list(playlists) == ["Peak Time", "Warm Up"]
+        assert playlists["Peak Time"]['track_ids'] == ['102', '101']
+        assert playlists["Warm Up"]['track_ids'] == ['103', '999']
+
+    def test_duplicate_playlist_name_keeps_first(self, tmp_path):
+        """Test that the first of several same-named playlists is kept."""
+        file_path = tmp_path / "duplicates.xml"
+        file_path.write_text(
+            '<DJ_PLAYLISTS><COLLECTION/><PLAYLISTS><NODE Type="0" Name="ROOT">'
+            '<NODE Type="1" Name="Dup"><TRACK Key="1"/></NODE>'
+            '<NODE Type="1" Name="Dup"><TRACK Key="2"/></NODE>'
+            '</NODE></PLAYLISTS></DJ_PLAYLISTS>',
+            encoding="utf-8"
+        )
+
+        xml_data = parse_rekordbox_xml(str(file_path))
+
+        assert xml_data['playlists'] == {'Dup': {'name': 'Dup', 'track_ids': ['1']}}
+        tree = parse_rekordbox_xml_advanced(str(file_path))
+        assert parse_rekordbox_xml_from_tree(tree)['playlists'] == xml_data['playlists']
+
+    def test_from_tree_matches_file_parse(self, sample_xml_path):
+        """Test that parsing an existing tree gives the same result."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+
+        assert parse_rekordbox_xml_from_tree(tree) == parse_rekordbox_xml(sample_xml_path)
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing XML file."""
+        with pytest.raises(FileNotFoundError):
+            parse_rekordbox_xml(str(tmp_path / "missing.xml"))
+
+    def test_malformed_xml(self, tmp_path):
+        """Test error handling: Malformed XML."""
+        file_path = tmp_path / "broken.xml"
+        file_path.write_text("<DJ_PLAYLISTS><COLLECTION>", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Failed to parse XML file"):
+            parse_rekordbox_xml(str(file_path))
+
+    def test_index_only_defers_tracks(self, sample_xml_path):
+        """Test that index_only reads playlists but no track metadata."""
+        xml_data = parse_rekordbox_xml(sample_xml_path, index_only=True)
+
+        assert xml_data['playlists'] == parse_rekordbox_xml(sample_xml_path)['playlists']
+        assert xml_data['tracks'] == {}
+        assert xml_data['xml_path'] == sample_xml_path
+
+
+class TestLoadTracks:
+    """Tests for load_tracks function."""
+
+    def test_only_requested_tracks(self, sample_xml_path):
+        """Test that only the requested collection tracks are parsed."""
+        tracks = load_tracks(sample_xml_path, ['103', '101', '999'])
+
+        assert set(tracks) == {'101', '103'}
+        assert tracks == {
+            track_id: track
+            for track_id, track in parse_rekordbox_xml(sample_xml_path)['tracks'].items()
+            if track_id in tracks
+        }
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing XML file."""
+        with pytest.raises(FileNotFoundError):
+            load_tracks(str(tmp_path / "missing.xml"), ['1'])
+
+
+class TestGetPlaylistTracks:
+    """Tests for get_playlist_tracks function."""
+
+    def test_tracks_in_playlist_order(self, sample_xml_path):
+        """Test that tracks are returned in playlist order."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        tracks = get_playlist_tracks(xml_data, "Peak Time")
+
+        assert [track['track_id'] for track in tracks] == ['102', '101']
+
+    def test_unknown_track_ids_skipped(self, sample_xml_path):
+        """Test that playlist entries missing from COLLECTION are skipped."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        tracks = get_playlist_tracks(xml_data, "Warm Up")
+
+        assert [track['track_id'] for track in tracks] == ['103']
+
+    def test_unknown_playlist(self, sample_xml_path):
+        """Test that an unknown playlist returns no tracks."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        assert get_playlist_tracks(xml_data, "Does Not Exist") == []
+
+    def test_index_only_loads_tracks_on_demand(self, sample_xml_path):
+        """Test that deferred tracks are loaded for the selected playlist only."""
+        xml_data = parse_rekordbox_xml(sample_xml_path, index_only=True)
+
+        tracks = get_playlist_tracks(xml_data, "Peak Time")
+
+        assert [track['track_id'] for track in tracks] == ['102', '101']
+        assert set(xml_data['tracks']) == {'101', '102'}
+        assert xml_data['tracks']['102']['name'] == "Second Track"
+
+
+class TestExtractTrackAudioPath:
+    """Tests for extract_track_audio_path function."""
+
+    def test_file_url_prefixes_stripped_and_decoded(self, sample_xml_path, monkeypatch):
+        """Test both Rekordbox Location prefixes and percent-decoding."""
+        monkeypatch.setattr(rekordbox_parser, '_IS_WINDOWS', False)
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        assert extract_track_audio_path(xml_data, '101') == "C:/Music/first.mp3"
+        assert xml_data['tracks']['102']['name'] == "Second Track"
+        assert extract_track_audio_path(xml_data, '103') == "C:/Music/third.flac"
+
+    def test_windows_separators(self, sample_xml_path, monkeypatch):
+        """Test that forward slashes become backslashes on Windows."""
+        monkeypatch.setattr(rekordbox_parser, '_IS_WINDOWS', True)
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        assert extract_track_audio_path(xml_data, '101') == "C:\\Music\\first.mp3"
+
+    def test_unknown_track(self, sample_xml_path):
+        """Test that unknown track IDs return an empty path."""
+        xml_data = parse_rekordbox_xml(sample_xml_path)
+
+        assert extract_track_audio_path(xml_data, '999') == ''
+
+
+class TestCueModification:
+    """Tests for inserting and removing cue points."""
+
+    def test_insert_memory_cue(self, sample_xml_path):
+        """Test memory cue attributes."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+
+        insert_memory_cue(track, 28000.0, "-16 bars", "yellow")
+
+        marks = track.findall('POSITION_MARK')
+        assert len(marks) == 1
+        assert dict(marks[0].attrib) == {
+            'Name': "-16 bars", 'Type': '0', 'Start': '28.000',
+            'Red': '255', 'Green': '255', 'Blue': '0'
+        }
+
+    def test_unknown_color_defaults_to_white(self, sample_xml_path, caplog):
+        """Test that an unknown color falls back to white with a warning."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+
+        insert_memory_cue(track, 1000.0, "Odd", "Chartreuse")
+
+        mark = track.find('POSITION_MARK')
+        assert (mark.get('Red'), mark.get('Green'), mark.get('Blue')) == ('255', '255', '255')
+        assert "Unknown color 'Chartreuse'" in caplog.text
+
+    def test_start_formatted_to_milliseconds(self, sample_xml_path):
+        """Test that Start is written in seconds rounded to 3 decimals."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+
+        for time_ms in (28125.0, 1235.5, 999.9996, 0.0):
+            insert_memory_cue(track, time_ms, "Cue", "green")
+
+        starts = [pm.get('Start') for pm in track.findall('POSITION_MARK')]
+        assert starts == ['28.125', '1.236', '1.000', '0.000']
+
+    def test_insert_hot_cue_uses_first_free_slot(self, sample_xml_path):
+        """Test that hot cues are auto-assigned to the first free slot."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+
+        # Slot 0 is taken by "Hot A"
+        insert_hot_cue(track, 60000.0, "Drop", "red")
+
+        drop = [pm for pm in track.findall('POSITION_MARK') if pm.get('Name') == "Drop"][0]
+        assert drop.get('Num') == '1'
+        assert drop.get('Start') == '60.000'
+
+    def test_hot_cue_attribute_layout(self, sample_xml_path):
+        """Test that hot cue attributes are written in Rekordbox's order."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+
+        insert_hot_cue(track, 60000.0, "Drop", "red")
+
+        assert list(track.find('POSITION_MARK').attrib.items()) == [
+            ('Name', "Drop"), ('Type', '0'), ('Start', '60.000'), ('Num', '0'),
+            ('Red', '255'), ('Green', '0'), ('Blue', '0')
+        ]
+
+    def test_insert_hot_cue_all_slots_taken(self, sample_xml_path):
+        """Test that no hot cue is added when all 8 slots are occupied."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+        for slot in range(8):
+            insert_hot_cue(track, 1000.0 * slot, f"Hot {slot}", "blue", hot_cue_num=slot)
+
+        insert_hot_cue(track, 60000.0, "Drop", "red")
+
+        assert len(track.findall('POSITION_MARK')) == 8
+
+    def test_shared_allocator_across_hot_cues(self, sample_xml_path):
+        """Test that one allocator hands out distinct slots without rescanning."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+        allocator = HotCueAllocator(track)
+
+        insert_hot_cue(track, 60000.0, "Drop", "red", allocator=allocator)
+        insert_hot_cue(track, 70000.0, "Fixed", "blue", hot_cue_num=2, allocator=allocator)
+        insert_hot_cue(track, 80000.0, "Next", "green", allocator=allocator)
+
+        nums = {pm.get('Name'): pm.get('Num') for pm in track.findall('POSITION_MARK')}
+        assert (nums["Drop"], nums["Fixed"], nums["Next"]) == ('1', '2', '3')
+        assert allocator.occupied == {0, 1, 2, 3}
+
+    def test_insert_cues_bulk(self, sample_xml_path):
+        """Test bulk insertion of memory and hot cues in one call."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+        cues = [
+            (28000.0, 'memory', "-16 bars", 'yellow'),
+            (60000.0, 'hot', "Drop", 'red'),
+            (92000.0, 'hot', "Second", 'blue'),
+        ]
+
+        inserted = insert_cues_bulk(track, cues)
+
+        assert inserted == cues
+        new_marks = track.findall('POSITION_MARK')[3:]
+        assert [pm.get('Name') for pm in new_marks] == ["-16 bars", "Drop", "Second"]
+        assert new_marks[0].get('Num') is None
+        # Slot 0 is taken by "Hot A", so hot cues fill slots 1 and 2
+        assert [pm.get('Num') for pm in new_marks[1:]] == ['1', '2']
+        assert new_marks[1].get('Start') == '60.000'
+
+    def test_insert_cues_bulk_skips_hot_cues_without_free_slot(self, sample_xml_path):
+        """Test that bulk insertion drops hot cues once all slots are used."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+        for slot in range(8):
+            insert_hot_cue(track, 1000.0 * slot, f"Hot {slot}", "blue", hot_cue_num=slot)
+        cues = [(30000.0, 'memory', "Memory", 'green'), (60000.0, 'hot', "Drop", 'red')]
+
+        inserted = insert_cues_bulk(track, cues)
+
+        assert inserted == cues[:1]
+        assert len(track.findall('POSITION_MARK')) == 9
+
+    def test_insert_cues_bulk_rolls_back_on_error(self, sample_xml_path):
+        """Test that a failing cue leaves none of the call's marks behind."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+        before = [etree.tostring(child) for child in track]
+        cues = [(28000.0, 'memory', "-16 bars", 'yellow'), ("bad", 'memory', "Broken", 'blue')]
+
+        with pytest.raises(TypeError):
+            insert_cues_bulk(track, cues)
+
+        assert [etree.tostring(child) for child in track] == before
+
+    def test_remove_memory_cues_keeps_hot_cues(self, sample_xml_path):
+        """Test that only memory cues are removed by default."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+
+        removed = remove_existing_cues(track)
+
+        assert removed == 2
+        assert [pm.get('Name') for pm in track.findall('POSITION_MARK')] == ["Hot A"]
+
+    def test_remove_keeps_non_cue_children_in_order(self, sample_xml_path):
+        """Test that TEMPO and new marks keep their order around removed cues."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '101')
+        insert_memory_cue(track, 1000.0, "New", "green")
+        etree.SubElement(track, 'TEMPO', Bpm="130.00")
+
+        remove_existing_cues(track, remove_memory=False, remove_hot=True)
+
+        assert [(child.tag, child.get('Name')) for child in track] == [
+            ('TEMPO', None), ('POSITION_MARK', "Intro"), ('POSITION_MARK', "Loop"),
+            ('POSITION_MARK', "New"), ('TEMPO', None)
+        ]
+
+    def test_remove_all_cues(self, sample_xml_path):
+        """Test removing both memory and hot cues."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        track = get_track_element_by_id(tree, '102')
+        insert_memory_cue(track, 1000.0, "Memory", "green")
+        insert_hot_cue(track, 2000.0, "Hot", "red")
+
+        removed = remove_existing_cues(track, remove_memory=True, remove_hot=True)
+
+        assert removed == 2
+        assert track.findall('POSITION_MARK') == []
+
+    def test_get_track_element_by_id_unknown(self, sample_xml_path):
+        """Test that unknown track IDs return None."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+
+        assert get_track_element_by_id(tree, '999') is None
+
+    def test_track_index_lookup(self, sample_xml_path):
+        """Test that an index lookup returns the same element as a tree scan."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+
+        track_index = build_track_index(tree)
+
+        assert list(track_index) == ['101', '102', '103']
+        assert get_track_element_by_id(track_index, '102') is get_track_element_by_id(tree, '102')
+        assert get_track_element_by_id(track_index, '999') is None
+
+    def test_track_index_duplicate_and_missing_ids(self, tmp_path):
+        """Test that the index keeps the first duplicate and skips TRACKs without an ID."""
+        xml_path = tmp_path / "dupes.xml"
+        xml_path.write_text(
+            '<DJ_PLAYLISTS><COLLECTION>'
+            '<TRACK TrackID="1" Name="First"/><TRACK Name="No ID"/>'
+            '<TRACK TrackID="1" Name="Second"/>'
+            '</COLLECTION></DJ_PLAYLISTS>'
+        )
+        tree = parse_rekordbox_xml_advanced(str(xml_path))
+
+        track_index = build_track_index(tree)
+
+        assert list(track_index) == ['1']
+        assert get_track_element_by_id(track_index, '1') is get_track_element_by_id(tree, '1')
+        assert track_index['1'].get('Name') == 'First'
+
+    def test_collection_element_passed_directly(self, sample_xml_path):
+        """Test that lookups accept a pre-fetched COLLECTION element."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+
+        collection = get_collection_element(tree)
+
+        assert collection.tag == 'COLLECTION'
+        assert get_collection_element(collection) is collection
+        assert get_track_element_by_id(collection, '103') is get_track_element_by_id(tree, '103')
+        assert list(build_track_index(collection)) == ['101', '102', '103']
+
+
+class TestExportModifiedXml:
+    """Tests for export_modified_xml function."""
+
+    def test_round_trip(self, sample_xml_path, tmp_path):
+        """Test that an exported file parses back with the inserted cues."""
+        tree = parse_rekordbox_xml_advanced(sample_xml_path)
+        insert_hot_cue(get_track_element_by_id(tree, '102'), 90000.0, "Drop", "red")
+
+        output_path = export_modified_xml(tree, str(tmp_path / "out.xml"))
+        xml_data = parse_rekordbox_xml(output_path)
+
+        cue_points = xml_data['tracks']['102']['cue_points']
+        assert [(cue['name'], cue['position']) for cue in cue_points] == [("Drop", 90.0)]
+        assert xml_data['playlists'] == parse_rekordbox_xml(sample_xml_path)['playlists']
+
+    def test_pretty_flag(self, tmp_path):
+        """Test that pretty=False skips re-indenting the output."""
+        source = tmp_path / "compact.xml"
+        source.write_text(
+            '<DJ_PLAYLISTS><COLLECTION><TRACK TrackID="1"/></COLLECTION></DJ_PLAYLISTS>',
+            encoding="utf-8"
+        )
+        tree = parse_rekordbox_xml_advanced(str(source))
+
+        flat = export_modified_xml(tree, str(tmp_path / "flat.xml"), pretty=False)
+        pretty = export_modified_xml(tree, str(tmp_path / "pretty.xml"), pretty=True)
+
+        with open(flat, encoding="utf-8") as f:
+            assert '<COLLECTION><TRACK TrackID="1"/></COLLECTION>' in f.read()
+        with open(pretty, encoding="utf-8") as f:
+            assert '\n    <TRACK TrackID="1"/>\n' in f.read()
+
+    def test_pretty_reindents_source_whitespace(self, tmp_path):
+        """Test that source indentation is dropped on parse so pretty output is regular."""
+        source = tmp_path / "odd.xml"
+        source.write_text(
+            '<DJ_PLAYLISTS>\n<COLLECTION>\n        <TRACK TrackID="1"/>\n</COLLECTION>\n</DJ_PLAYLISTS>',
+            encoding="utf-8"
+        )
+        tree = parse_rekordbox_xml_advanced(str(source))
+
+        pretty = export_modified_xml(tree, str(tmp_path / "pretty.xml"), pretty=True)
+
+        with open(pretty, encoding="utf-8") as f:
+            assert '<COLLECTION>\n    <TRACK TrackID="1"/>\n  </COLLECTION>' in f.read()
+
+
+class TestExportModifiedXmlStreaming:
+    """Tests for export_modified_xml_streaming function."""
+
+    def test_unmodified_copy_round_trips(self, sample_xml_path, tmp_path):
+        """Test that tracks, playlists and PRODUCT survive a plain copy."""
+        output_path = export_modified_xml_streaming(sample_xml_path, output_path=str(tmp_path / "out.xml"))
+
+        assert parse_rekordbox_xml(output_path) == parse_rekordbox_xml(sample_xml_path)
+        product = parse_rekordbox_xml_advanced(output_path).getroot().find('PRODUCT')
+        assert product.get('Name') == "rekordbox"
+
+    def test_modify_callback_applied(self, sample_xml_path, tmp_path):
+        """Test that the callback can insert cues on collection tracks."""
+        def add_drop(track):
+            if track.get('TrackID') == '102':
+                insert_hot_cue(track, 90000.0, "Drop", "red")
+
+        output_path = export_modified_xml_streaming(
+            sample_xml_path, add_drop, output_path=str(tmp_path / "out.xml")
+        )
+        xml_data = parse_rekordbox_xml(output_path)
+
+        assert [cue['name'] for cue in xml_data['tracks']['102']['cue_points']] == ["Drop"]
+        assert xml_data['tracks']['103']['cue_points'] == []
+        assert xml_data['playlists'] == parse_rekordbox_xml(sample_xml_path)['playlists']
+
+    def test_missing_file(self, tmp_path):
+        """Test error handling: Missing XML file."""
+        with pytest.raises(FileNotFoundError):
+            export_modified_xml_streaming(str(tmp_path / "missing.xml"))
+
+    def test_truncated_source_leaves_no_output(self, tmp_path):
+        """Test that a parse error mid-stream leaves nothing at the output path."""
+        truncated_path = tmp_path / "truncated.xml"
+        truncated_path.write_text(SAMPLE_XML[:SAMPLE_XML.index('<TRACK TrackID="102"')], encoding="utf-8")
+        output_path = tmp_path / "out.xml"
+
+        with pytest.raises(ValueError):
+            export_modified_xml_streaming(str(truncated_path), output_path=str(output_path))
+
+        assert list(tmp_path.iterdir()) == [truncated_path]
+
+    def test_pretty_output_indented(self, sample_xml_path, tmp_path):
+        """Test that pretty output is re-indented instead of copying source tails."""
+        output_path = export_modified_xml_streaming(
+            sample_xml_path, output_path=str(tmp_path / "out.xml"), pretty=True
+        )
+        lines = open(output_path, encoding="utf-8").read().splitlines()
+
+        assert all(line.strip() for line in lines)
+        assert '  <COLLECTION Entries="3">' in lines
+        assert any(line.startswith('    <TRACK TrackID="102"') for line in lines)
+        assert parse_rekordbox_xml(output_path) == parse_rekordbox_xml(sample_xml_path)
@@ -1,20 +1,124 @@
 """
 PyQt5-based UI for Rekordbox Autocuer batch processing.
 """
+import logging
 import sys
 import os
+from collections import OrderedDict
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QComboBox, QProgressBar, QFileDialog,
     QGraphicsView, QGraphicsScene, QMessageBox, QFrame
 )
-from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPen, QColor, QPainter, QFont
+from PyQt5.QtCore import Qt, QRectF, QPointF, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QPen, QColor, QPainter, QPainterPath, QPixmap, QTransform, QFont
 
 from rekordbox_parser import parse_rekordbox_xml, get_playlist_tracks, extract_track_audio_path
-from audio_processor import load_audio_file, generate_waveform_data
+from audio_processor import generate_waveform_cached
 from batch_processor import process_track_batch
 
+# Prefetched waveforms kept for tracks the user hasn't reached yet
+WAVEFORM_CACHE_SIZE = 2
+
+# Coarsest level kept in a WaveformCanvas mip pyramid
+MIN_MIP_POINTS = 64
+
+# Below this viewport size nothing useful can be drawn, so rendering is skipped
+MIN_DRAW_WIDTH = 50
+MIN_DRAW_HEIGHT = 40
+
+# Quiet period after the last resize event before the canvas is redrawn
+RESIZE_REDRAW_DELAY_MS = 50
+
+# Full-scale value of the int16 envelope a WaveformCanvas draws from
+ENVELOPE_FULL_SCALE = 32767
+
+# One row per playlist track: drop time in ms and whether it was marked
+DROP_DTYPE = np.dtype([('drop_ms', 'f8'), ('marked', '?')])
+
+
+class JobSignals(QObject):
+    """Signals emitted by a background job, delivered on the UI thread."""
+
+    finished = pyqtSignal(str, object)  # job key, result
+    failed = pyqtSignal(str, str)  # job key, error message
+
+
+class WaveformJob(QRunnable):
+    """Decode a track and generate its waveform on a QThreadPool worker."""
+
+    def __init__(self, track_id, file_path, bins=1024):
+        super().__init__()
+        self.track_id = track_id
+        self.file_path = file_path
+        self.bins = bins
+        self.signals = JobSignals()
+
+    def run(self):
+        try:
+            waveform_data = generate_waveform_cached(self.file_path, bins=self.bins)
+        except Exception as e:
+            self.signals.failed.emit(self.track_id, str(e))
+            return
+        self.signals.finished.emit(self.track_id, waveform_data)
+
+
+class XmlIndexJob(QRunnable):
+    """Read the playlist index of a Rekordbox XML on a QThreadPool worker."""
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = JobSignals()
+
+    def run(self):
+        try:
+            # Track metadata is loaded per playlist when one is selected
+            xml_data = parse_rekordbox_xml(self.file_path, index_only=True)
+        except Exception as e:
+            self.signals.failed.emit(self.file_path, str(e))
+            return
+        self.signals.finished.emit(self.file_path, xml_data)
+
+
+class PlaylistTracksJob(QRunnable):
+    """Load a playlist's deferred track metadata on a QThreadPool worker."""
+
+    def __init__(self, xml_data, playlist_name):
+        super().__init__()
+        self.xml_data = xml_data
+        self.playlist_name = playlist_name
+        self.signals = JobSignals()
+
+    def run(self):
+        try:
+            tracks = get_playlist_tracks(self.xml_data, self.playlist_name)
+        except Exception as e:
+            self.signals.failed.emit(self.playlist_name, str(e))
+            return
+        self.signals.finished.emit(self.playlist_name, tracks)
+
+
+class ExportJob(QRunnable):
+    """Apply marked drops and write the exported XML on a QThreadPool worker."""
+
+    def __init__(self, xml_path, drop_markers):
+        super().__init__()
+        self.xml_path = xml_path
+        self.drop_markers = drop_markers
+        self.error = None  # Exception that failed the export, for picking the dialog
+        self.signals = JobSignals()
+
+    def run(self):
+        try:
+            output_path = process_track_batch(self.xml_path, self.drop_markers)
+        except Exception as e:
+            self.error = e
+            self.signals.failed.emit(self.xml_path, str(e))
+            return
+        self.signals.finished.emit(self.xml_path, output_path)
+
 
 class WaveformCanvas(QGraphicsView):
     """Interactive waveform display canvas with click-to-mark functionality."""
@@ -22,14 +126,46 @@ class WaveformCanvas(QGraphicsView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.scene = QGraphicsScene(self)
+        # A handful of items; a BSP index would only cost upkeep on moves
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(self.scene)
 
+        # The scene rect tracks the viewport, so scene and viewport
+        # coordinates are the same and there is never anything to scroll
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+
         # Waveform data
-        self.waveform_data = []
+        self.waveform_data = np.zeros(0, dtype=np.float32)
+        self._quantized = np.zeros(0, dtype=np.int16)  # waveform_data scaled to 0..ENVELOPE_FULL_SCALE
+        self._scale_buffer = np.zeros(0, dtype=np.float32)  # Scratch space for quantizing
+        self._mip_levels = [self._quantized]  # _quantized, then halved peak envelopes
+        self._envelope_path_cache = {}  # mip level index -> unit-space (top, bottom) paths
+        self._grid_path = QPainterPath()  # Bar lines in unit space, x and y 0..1
         self.duration_seconds = 0
         self.bpm = 0
         self.drop_position = None  # Position in seconds where user marked the drop
 
+        # Grid and waveform are rendered once per track/size into a single
+        # pixmap item; the marker items live for the canvas's lifetime and
+        # are moved or hidden, never recreated
+        self._background_item = self.scene.addPixmap(QPixmap())
+        self._marker_line = self.scene.addLine(0, 0, 0, 0, QPen(QColor(255, 50, 50), 3))
+        self._marker_line.setVisible(False)
+        self._marker_text = self.scene.addText("")
+        self._marker_text.setDefaultTextColor(QColor(255, 50, 50))
+        self._marker_text.setVisible(False)
+        self._draw_pending = False  # A draw was skipped while hidden or too small
+        self._background_state = None  # (width, height, pixel ratio) the background was rendered at
+
+        # Dragging a window edge sends a resize per mouse move; redraw once
+        # the size settles instead of re-rendering the pixmap for each one
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_REDRAW_DELAY_MS)
+        self._resize_timer.timeout.connect(self.draw_waveform)
+
         # Visual settings
         self.setRenderHint(QPainter.Antialiasing)
         self.setBackgroundBrush(QColor(30, 30, 30))
@@ -37,87 +173,226 @@ class WaveformCanvas(QGraphicsView):
 
     def set_waveform(self, waveform_data, duration_seconds, bpm):
         """Set the waveform data and redraw."""
-        self.waveform_data = waveform_data
+        # Convert and normalize once per track; redraws only rescale to
+        # the current viewport height. The display copy is quantized to
+        # int16, half the float32 size, which stays finer than a device
+        # pixel at any plot height (uint8 left visible 3px steps on a
+        # full-screen HiDPI canvas)
+        self.waveform_data = np.asarray(waveform_data, dtype=np.float32)
+        max_amplitude = float(self.waveform_data.max()) if len(self.waveform_data) else 0.0
+        if max_amplitude <= 0:
+            max_amplitude = 1
+        # Scale and round in a reused scratch buffer; only the int16 result
+        # is a fresh allocation
+        if self._scale_buffer.shape != self.waveform_data.shape:
+            self._scale_buffer = np.empty_like(self.waveform_data)
+        np.multiply(self.waveform_data, ENVELOPE_FULL_SCALE / max_amplitude, out=self._scale_buffer)
+        np.rint(self._scale_buffer, out=self._scale_buffer)
+        self._quantized = self._scale_buffer.astype(np.int16)
+        self._mip_levels = self._build_mip_levels(self._quantized)
+        self._envelope_path_cache = {}
+        self._background_state = None
         self.duration_seconds = duration_seconds
         self.bpm = bpm
+        self._grid_path = self._build_grid_path(duration_seconds, bpm)
         self.drop_position = None
         self.draw_waveform()
 
+    @staticmethod
+    def _build_grid_path(duration_seconds, bpm):
+        """Build the bar lines as one unit-space path, x as a fraction of the track."""
+        grid_path = QPainterPath()
+        if bpm <= 0 or duration_seconds <= 0:
+            return grid_path
+
+        seconds_per_beat = 60.0 / bpm
+        seconds_per_bar = seconds_per_beat * 4  # Assuming 4/4 time
+
+        num_bars = int(duration_seconds / seconds_per_bar)
+        for x in (np.arange(num_bars + 1) * (seconds_per_bar / duration_seconds)).tolist():
+            grid_path.moveTo(x, 0)
+            grid_path.lineTo(x, 1)
+        return grid_path
+
+    @staticmethod
+    def _build_mip_levels(envelope):
+        """Halve the envelope by pairwise peaks down to MIN_MIP_POINTS."""
+        levels = [envelope]
+        level = envelope
+        while len(level) > MIN_MIP_POINTS:
+            pairs = len(level) // 2 * 2
+            halved = np.maximum(level[0:pairs:2], level[1:pairs:2])
+            if pairs < len(level):
+                # Odd length: the last point stands in for its own pair
+                halved = np.append(halved, level[-1])
+            levels.append(halved)
+            level = halved
+        return levels
+
+    def _mip_level_for(self, width):
+        """Return the index of the coarsest pyramid level with a point per pixel."""
+        for index in range(len(self._mip_levels) - 1, 0, -1):
+            if len(self._mip_levels[index]) >= width:
+                return index
+        return 0
+
+    def _envelope_paths(self, level_index):
+        """
+        Return the top and bottom envelope paths for a pyramid level.
+
+        Paths are built once per level in unit space (x from 0 to 1 across
+        the plot, y from -1 to 1 around the centre line) and reused for
+        every size the canvas is drawn at.
+        """
+        paths = self._envelope_path_cache.get(level_index)
+        if paths is not None:
+            return paths
+
+        # Hand Qt plain floats; indexing the ndarray per point would box a
+        # NumPy scalar each time
+        envelope = self._mip_levels[level_index]
+        num_points = len(envelope)
+        xs = (np.arange(num_points) / num_points).tolist()
+        amplitudes = (envelope * (1.0 / ENVELOPE_FULL_SCALE)).tolist()
+
+        # One path per envelope half. Each segment stays its own subpath;
+        # stroking one long connected polyline with a 2px antialiased pen
+        # is ~50x slower in Qt
+        top_path = QPainterPath()
+        bottom_path = QPainterPath()
+        for i in range(num_points - 1):
+            x1, x2 = xs[i], xs[i + 1]
+            amplitude1, amplitude2 = amplitudes[i], amplitudes[i + 1]
+
+            top_path.moveTo(x1, -amplitude1)
+            top_path.lineTo(x2, -amplitude2)
+            # Bottom half is mirrored
+            bottom_path.moveTo(x1, amplitude1)
+            bottom_path.lineTo(x2, amplitude2)
+
+        paths = (top_path, bottom_path)
+        self._envelope_path_cache[level_index] = paths
+        return paths
+
     def draw_waveform(self):
         """Draw the waveform, grid, and drop marker."""
-        self.scene.clear()
+        viewport_size = self.viewport().size()
+        if (not self.isVisible() or viewport_size.width() < MIN_DRAW_WIDTH
+                or viewport_size.height() < MIN_DRAW_HEIGHT):
+            # Nothing would be seen; draw when the canvas is next shown
+            self._draw_pending = True
+            return
 
-        if not self.waveform_data or self.duration_seconds == 0:
+        self._draw_pending = False
+        # Resize events also arrive for style and layout changes that keep
+        # the size; the background only depends on the data and the size
+        background_state = (viewport_size.width(), viewport_size.height(), self.devicePixelRatioF())
+        if background_state != self._background_state:
+            self._render_background()
+            self._background_state = background_state
+        self._update_marker()
+
+    def _render_background(self):
+        """Paint the grid and waveform into the cached background pixmap."""
+        viewport_size = self.viewport().size()
+        self.scene.setSceneRect(0, 0, viewport_size.width(), viewport_size.height())
+
+        if len(self.waveform_data) == 0 or self.duration_seconds == 0:
+            self._background_item.setPixmap(QPixmap())
             return
 
-        width = self.viewport().width() - 20
-        height = self.viewport().height() - 20
+        width = viewport_size.width() - 20
+        height = viewport_size.height() - 20
 
-        # Draw BPM grid (bar lines)
-        if self.bpm > 0:
-            seconds_per_beat = 60.0 / self.bpm
-            seconds_per_bar = seconds_per_beat * 4  # Assuming 4/4 time
+        pixel_ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(viewport_size * pixel_ratio)
+        pixmap.setDevicePixelRatio(pixel_ratio)
+        pixmap.fill(Qt.transparent)
 
-            num_bars = int(self.duration_seconds / seconds_per_bar)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
 
-            grid_pen = QPen(QColor(60, 60, 60), 1)
-            for i in range(num_bars + 1):
-                bar_time = i * seconds_per_bar
-                x = (bar_time / self.duration_seconds) * width + 10
-                self.scene.addLine(x, 10, x, height + 10, grid_pen)
+        # Draw BPM grid (bar lines), cached in unit space like the envelope
+        if not self._grid_path.isEmpty():
+            painter.setPen(QPen(QColor(60, 60, 60), 1))
+            painter.drawPath(QTransform.fromTranslate(10, 10).scale(width, height).map(self._grid_path))
 
         # Draw waveform
         waveform_pen = QPen(QColor(100, 150, 255), 2)
         center_y = height / 2 + 10
 
-        # Normalize waveform data
-        if self.waveform_data:
-            max_amplitude = max(self.waveform_data) if max(self.waveform_data) > 0 else 1
-
-            for i in range(len(self.waveform_data) - 1):
-                x1 = (i / len(self.waveform_data)) * width + 10
-                x2 = ((i + 1) / len(self.waveform_data)) * width + 10
-
-                # Normalize and scale amplitude
-                amplitude1 = (self.waveform_data[i] / max_amplitude) * (height / 2)
-                amplitude2 = (self.waveform_data[i + 1] / max_amplitude) * (height / 2)
+        # Scale the cached unit-space envelope into the plot area; mapping
+        # a path through a QTransform is native and far cheaper than
+        # rebuilding it point by point
+        top_unit, bottom_unit = self._envelope_paths(self._mip_level_for(width))
+        transform = QTransform.fromTranslate(10, center_y).scale(width, height / 2)
+        top_path = transform.map(top_unit)
+        bottom_path = transform.map(bottom_unit)
+
+        painter.setPen(waveform_pen)
+        painter.drawPath(top_path)
+        painter.drawPath(bottom_path)
+        painter.end()
+
+        self._background_item.setPixmap(pixmap)
+
+    def _update_marker(self):
+        """Move the drop marker line and its label, or hide them."""
+        if self.drop_position is None or len(self.waveform_data) == 0 or self.duration_seconds == 0:
+            self._marker_line.setVisible(False)
+            self._marker_text.setVisible(False)
+            return
 
-                # Draw top half
-                self.scene.addLine(x1, center_y - amplitude1, x2, center_y - amplitude2, waveform_pen)
-                # Draw bottom half (mirrored)
-                self.scene.addLine(x1, center_y + amplitude1, x2, center_y + amplitude2, waveform_pen)
+        width = self.viewport().width() - 20
+        height = self.viewport().height() - 20
 
-        # Draw drop marker if set
-        if self.drop_position is not None:
-            marker_x = (self.drop_position / self.duration_seconds) * width + 10
-            marker_pen = QPen(QColor(255, 50, 50), 3)
-            self.scene.addLine(marker_x, 10, marker_x, height + 10, marker_pen)
+        marker_x = (self.drop_position / self.duration_seconds) * width + 10
+        self._marker_line.setLine(marker_x, 10, marker_x, height + 10)
 
-            # Add timestamp label
-            minutes = int(self.drop_position // 60)
-            seconds = int(self.drop_position % 60)
-            time_str = f"{minutes:02d}:{seconds:02d}"
+        # Timestamp label
+        minutes = int(self.drop_position // 60)
+        seconds = int(self.drop_position % 60)
+        self._marker_text.setPlainText(f"{minutes:02d}:{seconds:02d}")
+        self._marker_text.setPos(marker_x + 5, 10)
 
-            text = self.scene.addText(time_str)
-            text.setDefaultTextColor(QColor(255, 50, 50))
-            text.setPos(marker_x + 5, 10)
+        self._marker_line.setVisible(True)
+        self._marker_text.setVisible(True)
 
     def mousePressEvent(self, event):
         """Handle mouse click to mark drop position."""
-        if event.button() == Qt.LeftButton and self.waveform_data:
-            # Convert click position to time
-            scene_pos = self.mapToScene(event.pos())
+        if event.button() == Qt.LeftButton and len(self.waveform_data) > 0:
+            # Convert click position to time; viewport and scene
+            # coordinates match, so no mapToScene is needed
             width = self.viewport().width() - 20
 
-            relative_x = scene_pos.x() - 10
+            relative_x = event.pos().x() - 10
             if 0 <= relative_x <= width:
-                self.drop_position = (relative_x / width) * self.duration_seconds
-                self.draw_waveform()
+                self._move_drop(relative_x, width)
+
+    def mouseMoveEvent(self, event):
+        """Drag with the left button held to scrub the drop position."""
+        if event.buttons() & Qt.LeftButton and self.drop_position is not None:
+            width = self.viewport().width() - 20
+            relative_x = min(max(event.pos().x() - 10, 0), width)
+            self._move_drop(relative_x, width)
+
+    def _move_drop(self, relative_x, width):
+        """Set the drop from a plot x offset and move the marker to it."""
+        self.drop_position = (relative_x / width) * self.duration_seconds
+        # The background pixmap is unchanged; moving the marker items makes
+        # the view repaint just their old and new bounding strips
+        self._update_marker()
 
     def resizeEvent(self, event):
-        """Redraw on resize."""
+        """Redraw once resizing pauses for RESIZE_REDRAW_DELAY_MS."""
         super().resizeEvent(event)
-        self.draw_waveform()
+        self._resize_timer.start()
+
+    def showEvent(self, event):
+        """Catch up on a draw that was skipped while hidden."""
+        super().showEvent(event)
+        if self._draw_pending:
+            self.draw_waveform()
 
     def get_drop_position(self):
         """Get the marked drop position in seconds."""
@@ -134,9 +409,16 @@ class RecordboxAutocuerApp(QMainWindow):
         self.xml_data = None
         self.xml_file_path = None  # Store original XML path for export
         self.current_playlist_name = None  # Store current playlist name
+        self._playlist_names = []  # Combo entries after the placeholder, in order
         self.current_playlist_tracks = []
         self.current_track_index = 0
-        self.drop_markers = {}  # track_id -> drop_position mapping
+        self._drop_track_ids = []  # Track IDs of the playlist being marked, in order
+        self._drops = np.zeros(0, dtype=DROP_DTYPE)  # Row i is the drop for _drop_track_ids[i]
+        self._waveform_jobs = {}  # track_id -> in-flight WaveformJob
+        self._xml_job = None  # In-flight XmlIndexJob, kept alive until it reports
+        self._export_job = None  # In-flight ExportJob, kept alive until it reports
+        self._playlist_jobs = {}  # playlist name -> in-flight PlaylistTracksJob
+        self._waveform_cache = OrderedDict()  # track_id -> prefetched waveform, oldest first
 
         self.init_ui()
 
@@ -166,7 +448,7 @@ class RecordboxAutocuerApp(QMainWindow):
 
         self.playlist_combo = QComboBox()
         self.playlist_combo.setEnabled(False)
-        self.playlist_combo.currentTextChanged.connect(self.on_playlist_selected)
+        self.playlist_combo.currentIndexChanged.connect(self.on_playlist_selected)
         file_layout.addWidget(self.playlist_combo)
 
         self.start_button = QPushButton("Start Processing")
@@ -254,43 +536,104 @@ class RecordboxAutocuerApp(QMainWindow):
         )
 
         if file_path:
-            try:
-                self.xml_data = parse_rekordbox_xml(file_path)
-                self.xml_file_path = file_path  # Store for later export
-                self.xml_path_label.setText(f"Loaded: {os.path.basename(file_path)}")
-                self.xml_path_label.setStyleSheet("color: green;")
-
-                # Populate playlist dropdown
-                self.playlist_combo.clear()
-                playlists = self.xml_data.get('playlists', [])
-
-                if playlists:
-                    self.playlist_combo.addItem("-- Select Playlist --")
-                    for playlist in playlists:
-                        self.playlist_combo.addItem(playlist['name'])
-                    self.playlist_combo.setEnabled(True)
-                else:
-                    QMessageBox.warning(self, "No Playlists", "No playlists found in XML file.")
-
-                self.statusBar().showMessage(f"Loaded {len(playlists)} playlists")
-
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load XML: {str(e)}")
-                self.xml_path_label.setText("Error loading XML")
-                self.xml_path_label.setStyleSheet("color: red;")
-
-    def on_playlist_selected(self, playlist_name):
+            # Parse off the UI thread so the dialog closes straight away
+            self.browse_button.setEnabled(False)
+            self.playlist_combo.setEnabled(False)
+            self.start_button.setEnabled(False)
+            self.xml_path_label.setText(f"Loading: {os.path.basename(file_path)}...")
+            self.xml_path_label.setStyleSheet("color: gray;")
+            self.statusBar().showMessage("Reading playlists...")
+
+            job = XmlIndexJob(file_path)
+            job.signals.finished.connect(self._on_xml_loaded)
+            job.signals.failed.connect(self._on_xml_failed)
+            self._xml_job = job
+            QThreadPool.globalInstance().start(job)
+
+    def _on_xml_loaded(self, file_path, xml_data):
+        """Show the playlists of a freshly parsed XML."""
+        self._xml_job = None
+        self.browse_button.setEnabled(True)
+
+        self.xml_data = xml_data
+        self.xml_file_path = file_path  # Store for later export
+        self.xml_path_label.setText(f"Loaded: {os.path.basename(file_path)}")
+        self.xml_path_label.setStyleSheet("color: green;")
+
+        # Populate playlist dropdown. Signals stay blocked while it is
+        # rebuilt so clearing and refilling it doesn't look like selections
+        playlists = self.xml_data.get('playlists', {})
+        self._playlist_names = list(playlists)
+
+        self.playlist_combo.blockSignals(True)
+        self.playlist_combo.clear()
+        if playlists:
+            # One batched model insert rather than one per playlist
+            self.playlist_combo.addItems(["-- Select Playlist --"] + self._playlist_names)
+        self.playlist_combo.blockSignals(False)
+
+        if playlists:
+            self.playlist_combo.setEnabled(True)
+        else:
+            QMessageBox.warning(self, "No Playlists", "No playlists found in XML file.")
+
+        self.statusBar().showMessage(f"Loaded {len(playlists)} playlists")
+
+    def _on_xml_failed(self, file_path, message):
+        """Report an XML file that could not be parsed."""
+        self._xml_job = None
+        self.browse_button.setEnabled(True)
+
+        QMessageBox.critical(self, "Error", f"Failed to load XML: {message}")
+        self.xml_path_label.setText("Error loading XML")
+        self.xml_path_label.setStyleSheet("color: red;")
+
+    def _selected_playlist_name(self):
+        """Return the playlist chosen in the combo, or None for the placeholder."""
+        index = self.playlist_combo.currentIndex()
+        if 1 <= index <= len(self._playlist_names):
+            return self._playlist_names[index - 1]
+        return None
+
+    def on_playlist_selected(self, index):
         """Handle playlist selection."""
-        if playlist_name and playlist_name != "-- Select Playlist --":
-            tracks = get_playlist_tracks(self.xml_data, playlist_name)
+        playlist_name = self._selected_playlist_name()
+        if playlist_name is not None:
+            # The first selection reads the playlist's tracks from the XML,
+            # so look them up off the UI thread
+            self.start_button.setEnabled(False)
+            self.statusBar().showMessage(f"Loading playlist: {playlist_name}...")
+
+            if playlist_name in self._playlist_jobs:
+                return
+
+            job = PlaylistTracksJob(self.xml_data, playlist_name)
+            job.signals.finished.connect(self._on_playlist_tracks_ready)
+            job.signals.failed.connect(self._on_playlist_tracks_failed)
+            self._playlist_jobs[playlist_name] = job
+            QThreadPool.globalInstance().start(job)
+
+    def _on_playlist_tracks_ready(self, playlist_name, tracks):
+        """Select a playlist once its tracks are loaded, unless the user moved on."""
+        self._playlist_jobs.pop(playlist_name, None)
+        if self._selected_playlist_name() != playlist_name:
+            return
+
+        if tracks:
+            self.current_playlist_name = playlist_name  # Store playlist name
+            self.current_playlist_tracks = tracks
+            self.start_button.setEnabled(True)
+            self.statusBar().showMessage(f"Selected playlist: {playlist_name} ({len(tracks)} tracks)")
+        else:
+            QMessageBox.warning(self, "Empty Playlist", f"Playlist '{playlist_name}' has no tracks.")
 
-            if tracks:
-                self.current_playlist_name = playlist_name  # Store playlist name
-                self.current_playlist_tracks = tracks
-                self.start_button.setEnabled(True)
-                self.statusBar().showMessage(f"Selected playlist: {playlist_name} ({len(tracks)} tracks)")
-            else:
-                QMessageBox.warning(self, "Empty Playlist", f"Playlist '{playlist_name}' has no tracks.")
+    def _on_playlist_tracks_failed(self, playlist_name, message):
+        """Report a playlist whose tracks could not be loaded."""
+        self._playlist_jobs.pop(playlist_name, None)
+        if self._selected_playlist_name() != playlist_name:
+            return
+
+        QMessageBox.critical(self, "Error", f"Failed to load playlist tracks: {message}")
 
     def start_processing(self):
         """Start the batch processing workflow."""
@@ -298,7 +641,8 @@ class RecordboxAutocuerApp(QMainWindow):
             return
 
         self.current_track_index = 0
-        self.drop_markers = {}
+        self._drop_track_ids = [track['track_id'] for track in self.current_playlist_tracks]
+        self._drops = np.zeros(len(self._drop_track_ids), dtype=DROP_DTYPE)
 
         # Update progress bar
         self.progress_bar.setMaximum(len(self.current_playlist_tracks))
@@ -343,23 +687,95 @@ class RecordboxAutocuerApp(QMainWindow):
         file_path = extract_track_audio_path(self.xml_data, track['track_id'])
 
         if file_path and os.path.exists(file_path):
-            try:
-                self.statusBar().showMessage(f"Loading audio: {track['name']}...")
-                QApplication.processEvents()  # Update UI
+            self._cancel_stale_waveform_jobs()
+
+            waveform_data = self._waveform_cache.pop(track['track_id'], None)
+            if waveform_data is not None:
+                self._show_waveform(track, waveform_data)
+                return
+
+            # Decode off the UI thread; clear the canvas so the previous
+            # track's waveform can't be marked while this one loads
+            self.waveform_canvas.set_waveform([], 0, 0)
+            self.statusBar().showMessage(f"Loading audio: {track['name']}...")
+            self._start_waveform_job(track['track_id'], file_path)
+        else:
+            QMessageBox.warning(self, "File Not Found", f"Audio file not found:\n{file_path}\n\nSkipping track.")
+            self.skip_track()
 
-                audio_data, sample_rate = load_audio_file(file_path)
-                waveform_data = generate_waveform_data(audio_data, sample_rate, bins=1024)
+    def _current_track(self):
+        """Return the track being reviewed, or None once the playlist is done."""
+        if self.current_track_index < len(self.current_playlist_tracks):
+            return self.current_playlist_tracks[self.current_track_index]
+        return None
+
+    def _start_waveform_job(self, track_id, file_path):
+        """Queue a WaveformJob unless one is already running for the track."""
+        if track_id in self._waveform_jobs:
+            return  # e.g. the prefetch for this track is still decoding
+
+        job = WaveformJob(track_id, file_path, bins=1024)
+        job.signals.finished.connect(self._on_waveform_ready)
+        job.signals.failed.connect(self._on_waveform_failed)
+        self._waveform_jobs[track_id] = job
+        QThreadPool.globalInstance().start(job)
+
+    def _cancel_stale_waveform_jobs(self):
+        """Drop queued jobs for tracks that are neither current nor next."""
+        wanted = {
+            track['track_id']
+            for track in self.current_playlist_tracks[self.current_track_index:self.current_track_index + 2]
+        }
+        for track_id, job in list(self._waveform_jobs.items()):
+            # tryTake only succeeds for jobs that haven't started yet
+            if track_id not in wanted and QThreadPool.globalInstance().tryTake(job):
+                del self._waveform_jobs[track_id]
+
+    def _prefetch_next_track(self):
+        """Start decoding the next track while the user reviews this one."""
+        next_index = self.current_track_index + 1
+        if next_index >= len(self.current_playlist_tracks):
+            return
 
-                self.waveform_canvas.set_waveform(waveform_data, duration_seconds, track['bpm'])
+        track_id = self.current_playlist_tracks[next_index]['track_id']
+        if track_id in self._waveform_cache:
+            return
 
-                self.statusBar().showMessage(f"Track {self.current_track_index + 1}/{len(self.current_playlist_tracks)}: {track['name']}")
+        file_path = extract_track_audio_path(self.xml_data, track_id)
+        if file_path and os.path.exists(file_path):
+            self._start_waveform_job(track_id, file_path)
 
-            except Exception as e:
-                QMessageBox.warning(self, "Audio Load Error", f"Failed to load audio: {str(e)}\n\nSkipping track.")
-                self.skip_track()
-        else:
-            QMessageBox.warning(self, "File Not Found", f"Audio file not found:\n{file_path}\n\nSkipping track.")
-            self.skip_track()
+    def _show_waveform(self, track, waveform_data):
+        """Display a track's waveform and prefetch the one after it."""
+        self.waveform_canvas.set_waveform(waveform_data, track['duration_ms'] / 1000, track['bpm'])
+        self.statusBar().showMessage(f"Track {self.current_track_index + 1}/{len(self.current_playlist_tracks)}: {track['name']}")
+        self._prefetch_next_track()
+
+    def _on_waveform_ready(self, track_id, waveform_data):
+        """Display a finished waveform, or keep it if it was a prefetch."""
+        self._waveform_jobs.pop(track_id, None)
+
+        track = self._current_track()
+        if track is not None and track['track_id'] == track_id:
+            self._show_waveform(track, waveform_data)
+            return
+
+        self._waveform_cache[track_id] = waveform_data
+        self._waveform_cache.move_to_end(track_id)
+        while len(self._waveform_cache) > WAVEFORM_CACHE_SIZE:
+            self._waveform_cache.popitem(last=False)
+
+    def _on_waveform_failed(self, track_id, message):
+        """Report a waveform that failed to load for the current track."""
+        self._waveform_jobs.pop(track_id, None)
+
+        # A failed prefetch is retried, and reported, when its track comes up
+        track = self._current_track()
+        if track is None or track['track_id'] != track_id:
+            return
+
+        QMessageBox.warning(self, "Audio Load Error", f"Failed to load audio: {message}\n\nSkipping track.")
+        self.skip_track()
 
     def mark_drop_auto(self):
         """Automatically mark drop at the current position or prompt user."""
@@ -373,9 +789,8 @@ class RecordboxAutocuerApp(QMainWindow):
             )
             return
 
-        # Save drop marker
-        track = self.current_playlist_tracks[self.current_track_index]
-        self.drop_markers[track['track_id']] = drop_pos
+        # Save drop marker; the canvas works in seconds, the batch in ms
+        self._drops[self.current_track_index] = (drop_pos * 1000, True)
 
         # Move to next track
         self.next_track()
@@ -389,10 +804,20 @@ class RecordboxAutocuerApp(QMainWindow):
         self.current_track_index += 1
         self.load_current_track()
 
+    def _marked_count(self):
+        """Number of tracks with a marked drop."""
+        return int(np.count_nonzero(self._drops['marked']))
+
+    def _marked_drops(self):
+        """Return {track_id: drop_time_ms} for the marked tracks."""
+        marked = np.flatnonzero(self._drops['marked'])
+        drop_times_ms = self._drops['drop_ms'][marked].tolist()
+        return {self._drop_track_ids[i]: drop_ms for i, drop_ms in zip(marked.tolist(), drop_times_ms)}
+
     def finish_processing(self):
         """Finish the batch processing workflow."""
         # Check if any tracks were marked
-        if len(self.drop_markers) == 0:
+        if self._marked_count() == 0:
             QMessageBox.information(
                 self,
                 "No Tracks Marked",
@@ -402,7 +827,7 @@ class RecordboxAutocuerApp(QMainWindow):
             QMessageBox.information(
                 self,
                 "Marking Complete",
-                f"Batch marking complete!\n\nMarked drops for {len(self.drop_markers)} tracks.\n\nClick 'Process & Export XML' to generate the modified Rekordbox file."
+                f"Batch marking complete!\n\nMarked drops for {self._marked_count()} tracks.\n\nClick 'Process & Export XML' to generate the modified Rekordbox file."
             )
 
             # Show and enable export button
@@ -424,14 +849,15 @@ class RecordboxAutocuerApp(QMainWindow):
         self.key_label.setText("Key: --")
         self.duration_label.setText("Duration: --")
 
-        if len(self.drop_markers) > 0:
+        if self._marked_count() > 0:
             self.statusBar().showMessage("Marking complete. Click 'Process & Export XML' to continue.")
         else:
             self.statusBar().showMessage("Processing complete. Ready for next batch.")
 
     def export_xml(self):
         """Process marked tracks and export modified XML."""
-        if not self.drop_markers:
+        drop_markers = self._marked_drops()  # track_id -> drop time in ms
+        if not drop_markers:
             QMessageBox.warning(
                 self,
                 "No Tracks Marked",
@@ -451,7 +877,7 @@ class RecordboxAutocuerApp(QMainWindow):
         reply = QMessageBox.question(
             self,
             "Confirm Export",
-            f"Process {len(self.drop_markers)} tracks and generate modified XML?\n\n"
+            f"Process {len(drop_markers)} tracks and generate modified XML?\n\n"
             f"This will calculate and insert cue points based on the marked drops.",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.Yes
@@ -460,75 +886,80 @@ class RecordboxAutocuerApp(QMainWindow):
         if reply == QMessageBox.No:
             return
 
-        # Disable export button during processing
+        # Disable export button during processing. The batch runs off the
+        # UI thread, so the status message paints without pumping events
         self.export_button.setEnabled(False)
         self.statusBar().showMessage("Processing tracks and generating XML...")
-        QApplication.processEvents()
 
-        try:
-            # Call batch processor
-            output_path = process_track_batch(
-                self.xml_file_path,
-                self.drop_markers
-            )
+        job = ExportJob(self.xml_file_path, drop_markers)
+        job.signals.finished.connect(self._on_export_finished)
+        job.signals.failed.connect(self._on_export_failed)
+        self._export_job = job
+        QThreadPool.globalInstance().start(job)
+
+    def _on_export_finished(self, xml_path, output_path):
+        """Tell the user where the exported XML was written."""
+        self._export_job = None
+
+        # Success dialog with instructions
+        success_msg = QMessageBox(self)
+        success_msg.setIcon(QMessageBox.Information)
+        success_msg.setWindowTitle("Export Successful")
+        success_msg.setText(f"Modified XML exported successfully!")
+        success_msg.setInformativeText(
+            f"File saved to:\n{output_path}\n\n"
+            f"To import into Rekordbox:\n"
+            f"1. Open Rekordbox\n"
+            f"2. Go to File > Import Collection\n"
+            f"3. Select the exported XML file\n"
+            f"4. Rekordbox will merge the cue points with your existing library\n\n"
+            f"Note: This preserves your existing tracks and only updates cue points."
+        )
+        success_msg.setStandardButtons(QMessageBox.Ok)
+        success_msg.exec_()
 
-            # Success dialog with instructions
-            success_msg = QMessageBox(self)
-            success_msg.setIcon(QMessageBox.Information)
-            success_msg.setWindowTitle("Export Successful")
-            success_msg.setText(f"Modified XML exported successfully!")
-            success_msg.setInformativeText(
-                f"File saved to:\n{output_path}\n\n"
-                f"To import into Rekordbox:\n"
-                f"1. Open Rekordbox\n"
-                f"2. Go to File > Import Collection\n"
-                f"3. Select the exported XML file\n"
-                f"4. Rekordbox will merge the cue points with your existing library\n\n"
-                f"Note: This preserves your existing tracks and only updates cue points."
-            )
-            success_msg.setStandardButtons(QMessageBox.Ok)
-            success_msg.exec_()
+        self.statusBar().showMessage(f"Export complete: {output_path}")
 
-            self.statusBar().showMessage(f"Export complete: {output_path}")
+        # Reset for next batch
+        self.export_button.setEnabled(True)
 
-            # Reset for next batch
-            self.export_button.setEnabled(True)
+    def _on_export_failed(self, xml_path, message):
+        """Report a failed export, worded for the kind of failure."""
+        error = self._export_job.error
+        self._export_job = None
 
-        except FileNotFoundError as e:
+        if isinstance(error, FileNotFoundError):
             QMessageBox.critical(
                 self,
                 "File Not Found",
-                f"XML file not found:\n{str(e)}"
+                f"XML file not found:\n{message}"
             )
-            self.export_button.setEnabled(True)
-
-        except ValueError as e:
+        elif isinstance(error, ValueError):
             QMessageBox.critical(
                 self,
                 "Processing Error",
-                f"Failed to process tracks:\n{str(e)}"
+                f"Failed to process tracks:\n{message}"
             )
-            self.export_button.setEnabled(True)
-
-        except IOError as e:
+        elif isinstance(error, IOError):
             QMessageBox.critical(
                 self,
                 "Export Error",
-                f"Failed to export XML:\n{str(e)}"
+                f"Failed to export XML:\n{message}"
             )
-            self.export_button.setEnabled(True)
-
-        except Exception as e:
+        else:
             QMessageBox.critical(
                 self,
                 "Unexpected Error",
-                f"An unexpected error occurred:\n{str(e)}"
+                f"An unexpected error occurred:\n{message}"
             )
-            self.export_button.setEnabled(True)
+        self.statusBar().showMessage("Export failed.")
+        self.export_button.setEnabled(True)
 
 
 def main():
     """Run the application."""
+    # Batch progress and summaries are reported through logging
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
     app = QApplication(sys.argv)
     window = RecordboxAutocuerApp()
     window.show()